@@ -1,597 +1,2159 @@
-#!/usr/bin/env python3
-import os
-import sys
-import ast
-import json
-import argparse
-import subprocess
-import datetime
-from importlib import util as importlib_util
-
-from colorama import init, Fore, Style
-from tabulate import tabulate
-from rapidfuzz import process
-from git import Repo, exc as git_exc
-from rich.console import Console
-from rich.table import Table
-
-# ──────────────────────────────────────────────────
-init(autoreset=True)
-RESET = Style.RESET_ALL
-
-# ─── INTENT PATTERNS & ALIASES ───────────────────────────────────────────────
-INTENT_PATTERNS = {
-    "http request": [
-        "requests.get", "requests.post", "requests.put", "requests.delete",
-        "requests.head", "requests.options", "requests.patch",
-        "requests.Session", "requests.request",
-        "urllib.request.urlopen", "urllib3.PoolManager.request",
-        "http.client.HTTPConnection", "http.client.HTTPSConnection",
-        "httpx.get", "httpx.post", "httpx.put", "httpx.delete", "httpx.request",
-        "aiohttp.ClientSession.get", "aiohttp.ClientSession.post", "aiohttp.request",
-        "tornado.httpclient.AsyncHTTPClient.fetch",
-        "tornado.httpclient.HTTPClient.fetch",
-    ],
-    "file encryption": [
-        "cryptography.fernet.Fernet", "Fernet(",
-        "AES.new", "Crypto.Cipher.AES.new",
-        "Crypto.Cipher.ChaCha20.new", "ChaCha20Poly1305.new",
-        "hashlib.md5", "hashlib.sha256", "hashlib.sha512", "hashlib.blake2b",
-        "hmac.new", "hashlib.pbkdf2_hmac", "scrypt",
-        "rsa.encrypt", "RSA.import_key", "Crypto.PublicKey.RSA.generate",
-    ],
-    "shell exec": [
-        "os.system", "os.popen", "subprocess.run", "subprocess.Popen",
-        "subprocess.call", "subprocess.check_output", "subprocess.check_call",
-        "subprocess.Popen(shell=True", "commands.getoutput",
-        "pexpect.spawn", "shlex.split", "fabric.Connection", "paramiko.SSHClient",
-    ],
-    "database access": [
-        "sqlite3.connect", "psycopg2.connect", "pymysql.connect",
-        "mysql.connector.connect", "sqlalchemy.create_engine",
-        "cursor.execute", "engine.execute", "pymongo.MongoClient", "redis.Redis",
-        "motor.motor_asyncio.AsyncIOMotorClient",
-        "boto3.resource('dynamodb')", "boto3.client('dynamodb')",
-        "neo4j.GraphDatabase.driver", "elasticsearch.Elasticsearch",
-    ],
-    "file io": [
-        "open(", "Path.open(", "Path.write_text", "Path.read_text",
-        "os.remove", "os.unlink", "os.rename",
-        "os.mkdir", "os.makedirs", "shutil.copy", "shutil.move",
-        "shutil.rmtree", "tempfile.NamedTemporaryFile",
-        "tempfile.TemporaryDirectory", "glob.glob", "os.walk",
-    ],
-    "json": [
-        "json.load", "json.loads", "json.dump", "json.dumps",
-        "simplejson.loads", "simplejson.dumps",
-        "ujson.loads", "ujson.dumps",
-    ],
-    "xml": [
-        "xml.etree.ElementTree.parse", "xml.etree.ElementTree.fromstring",
-        "lxml.etree.parse", "lxml.objectify.fromstring",
-        "xml.dom.minidom.parseString", "xml.sax.make_parser",
-        "bs4.BeautifulSoup", "BeautifulSoup(",
-    ],
-    "yaml": [
-        "yaml.safe_load", "yaml.load", "yaml.FullLoader", "yaml.RoundTripLoader",
-        "ruamel.yaml.YAML().load", "ruamel.yaml.round_trip_load",
-    ],
-    "csv": [
-        "csv.reader", "csv.writer", "csv.DictReader", "csv.DictWriter",
-        "pandas.read_csv", "pandas.DataFrame.to_csv",
-        "numpy.loadtxt", "numpy.savetxt",
-    ],
-    "regex": [
-        "re.search", "re.match", "re.findall", "re.sub", "re.compile",
-        "regex.search", "regex.match",
-    ],
-    "logging": [
-        "logging.debug", "logging.info", "logging.warning",
-        "logging.error", "logging.critical", "logger.log",
-        "print(", "warnings.warn", "sys.stderr.write",
-    ],
-    "threading": [
-        "threading.Thread", "concurrent.futures.ThreadPoolExecutor",
-        "concurrent.futures.ProcessPoolExecutor",
-        "multiprocessing.Process", "multiprocessing.Pool",
-        "multiprocessing.dummy.Pool",
-    ],
-    "async tasks": [
-        "asyncio.create_task", "asyncio.run", "asyncio.gather",
-        "asyncio.ensure_future", "trio.run", "curio.run", "anyio.run",
-    ],
-    "socket": [
-        "socket.socket", "socket.bind", "socket.listen", "socket.connect",
-        "ssl.wrap_socket", "ssl.SSLContext", "asyncio.open_connection",
-        "asyncio.start_server", "websockets.connect", "websockets.serve",
-    ],
-    "http server": [
-        "http.server.HTTPServer", "http.server.SimpleHTTPRequestHandler",
-        "flask.Flask", "FastAPI(", "django.urls", "Sanic(",
-        "bottle.Bottle", "tornado.web.Application", "aiohttp.web.Application",
-    ],
-    "compression": [
-        "zipfile.ZipFile", "tarfile.open", "gzip.open",
-        "bz2.BZ2File", "lzma.open", "shutil.make_archive",
-        "patoolib.extract_archive",
-    ],
-    "image processing": [
-        "PIL.Image.open", "PIL.Image.save", "cv2.imread", "cv2.imwrite",
-        "cv2.VideoCapture", "skimage.io.imread", "skimage.io.imsave",
-        "Image.fromarray", "matplotlib.pyplot.imshow",
-    ],
-    "cli parsing": [
-        "argparse.ArgumentParser", "click.command", "typer.Typer",
-        "optparse.OptionParser", "docopt.docopt", "sys.argv",
-    ],
-    "caching": [
-        "functools.lru_cache", "cachetools.Cache", "django.core.cache",
-        "redis_cache.Cache", "dogpile.cache", "memcache.Client",
-    ],
-    "email sending": [
-        "smtplib.SMTP", "smtplib.SMTP_SSL",
-        "email.mime.text.MIMEText", "EmailMessage",
-        "yagmail.SMTP", "send_email",
-    ],
-    "validation": [
-        "pydantic.BaseModel", "validate_email", "cerberus.Validator",
-        "marshmallow.Schema", "jsonschema.validate",
-    ],
-    "authentication": [
-        "jwt.encode", "jwt.decode", "pyjwt.decode",
-        "werkzeug.security", "bcrypt.hashpw", "bcrypt.checkpw",
-    ],
-    "error handling": [
-        "try:", "except", "finally:", "raise", "assert", "logging.exception",
-    ],
-}
-
-INTENT_ALIASES = {
-    "http request":       ["http", "url", "req", "request", "httpx", "urllib"],
-    "file encryption":    ["encrypt", "crypto", "AES", "Fernet", "KDF", "hash"],
-    "shell exec":         ["shell", "exec", "bash", "sh", "system", "cmd", "subprocess"],
-    "database access":    ["database", "db", "sql", "nosql", "mongo", "redis"],
-    "file io":            ["file", "io", "fs", "filesystem", "path", "read", "write"],
-    "json":               ["json", "serialize", "deserialize", "simplejson", "ujson"],
-    "xml":                ["xml", "xslt", "dom", "sax", "beautifulsoup", "bs4", "lxml"],
-    "yaml":               ["yaml", "yml", "config", "settings", "ruamel"],
-    "csv":                ["csv", "table", "spreadsheet", "tsv", "pandas", "numpy"],
-    "regex":              ["regex", "re", "pattern", "regexp"],
-    "logging":            ["log", "logger", "warning", "error", "print"],
-    "threading":          ["thread", "threads", "parallel", "multiprocessing"],
-    "async tasks":        ["async", "asyncio", "trio", "curio", "anyio"],
-    "socket":             ["socket", "ssl", "websocket", "tcp", "udp"],
-    "http server":        ["server", "flask", "fastapi", "django", "sanic", "bottle"],
-    "compression":        ["zip", "tar", "gzip", "bz2", "lzma", "archive", "compress"],
-    "image processing":   ["image", "pil", "opencv", "cv2", "skimage", "matplotlib"],
-    "cli parsing":        ["cli", "argparse", "click", "typer", "optparse", "docopt"],
-    "caching":            ["cache", "caching", "lru", "redis", "memcache", "dogpile"],
-    "email sending":      ["email", "smtp", "mail", "yagmail", "messaging"],
-    "validation":         ["validate", "schema", "pydantic", "cerberus", "marshmallow", "jsonschema"],
-    "authentication":     ["auth", "jwt", "oauth", "token", "login", "bcrypt"],
-    "error handling":     ["error", "exception", "assert", "raise", "try", "catch"],
-}
-
-ALIAS_MAP = {
-    alias.lower(): intent
-    for intent, aliases in INTENT_ALIASES.items()
-    for alias in aliases
-}
-
-THEMES = {
-    "light": {
-        "dir":      Fore.CYAN + Style.BRIGHT,
-        "file":     Fore.GREEN + Style.BRIGHT,
-        "line":     Fore.YELLOW,
-        "code":     Fore.WHITE,
-        "conn":     Fore.MAGENTA,
-        "stat_hdr": Fore.CYAN + Style.BRIGHT,
-        "stat_val": Fore.YELLOW,
-    },
-    "dark": {
-        "dir":      Fore.BLUE + Style.BRIGHT,
-        "file":     Fore.WHITE + Style.BRIGHT,
-        "line":     Fore.MAGENTA,
-        "code":     Fore.WHITE,
-        "conn":     Fore.YELLOW,
-        "stat_hdr": Fore.CYAN + Style.BRIGHT,
-        "stat_val": Fore.YELLOW,
-    },
-}
-
-DIR_COLOR = FILE_COLOR = LINE_COLOR = CODE_COLOR = CONN_COLOR = ""
-STAT_HDR = STAT_VAL = ""
-
-def apply_theme(name: str):
-    global DIR_COLOR, FILE_COLOR, LINE_COLOR, CODE_COLOR, CONN_COLOR, STAT_HDR, STAT_VAL
-    th = THEMES.get(name, THEMES["light"])
-    DIR_COLOR, FILE_COLOR = th["dir"], th["file"]
-    LINE_COLOR, CODE_COLOR = th["line"], th["code"]
-    CONN_COLOR = th["conn"]
-    STAT_HDR, STAT_VAL = th["stat_hdr"], th["stat_val"]
-
-def load_plugins():
-    plugins = {}
-    pd = os.path.join(os.path.dirname(__file__), "plugins")
-    if os.path.isdir(pd):
-        for fn in sorted(os.listdir(pd)):
-            if fn.endswith(".py"):
-                spec = importlib_util.spec_from_file_location(fn, os.path.join(pd, fn))
-                mod  = importlib_util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                plugins[fn[:-3]] = mod
-    return plugins
-
-def get_full_name(node):
-    if isinstance(node, ast.Name):
-        return node.id
-    if isinstance(node, ast.Attribute):
-        p = get_full_name(node.value)
-        return f"{p}.{node.attr}"
-    return None
-
-def scan_file_ast(fp, patterns):
-    try:
-        src  = open(fp, encoding="utf-8", errors="ignore").read()
-        tree = ast.parse(src, filename=fp)
-    except Exception:
-        return []
-    hits = []
-    for n in ast.walk(tree):
-        if isinstance(n, ast.Call):
-            nm = get_full_name(n.func)
-            if nm in patterns:
-                ln   = n.lineno
-                code = src.splitlines()[ln-1].strip()
-                hits.append((ln, code))
-    return hits
-
-def find_intent_matches(intent, root, file_ext=None, name_filter=None, file_name_exact=None):
-    patterns = INTENT_PATTERNS[intent]
-    matches, results = {}, []
-    ext = file_ext.lstrip(".").lower() if file_ext else None
-    for dp, _, files in os.walk(root):
-        for fn in sorted(files):
-            if file_name_exact and fn != file_name_exact:
-                continue
-            low = fn.lower()
-            if ext and not low.endswith(f".{ext}"):
-                continue
-            if name_filter and name_filter.lower() not in low:
-                continue
-            if not fn.lower().endswith(".py"):
-                continue
-            full = os.path.join(dp, fn)
-            hits = scan_file_ast(full, patterns)
-            if hits:
-                matches[full] = hits
-                for ln, code in hits:
-                    results.append({"path": full, "line": ln, "code": code})
-    return matches, results
-
-def search_value(val, root, file_ext=None, name_filter=None, file_name_exact=None):
-    ext = file_ext.lstrip(".").lower() if file_ext else None
-    lowval = val.lower()
-    matches, results = {}, []
-    for dp, _, files in os.walk(root):
-        for fn in sorted(files):
-            if file_name_exact and fn != file_name_exact:
-                continue
-            low = fn.lower()
-            if ext and not low.endswith(f".{ext}"):
-                continue
-            if name_filter and name_filter.lower() not in low:
-                continue
-            full = os.path.join(dp, fn)
-            try:
-                for i, line in enumerate(open(full, encoding="utf-8", errors="ignore"), 1):
-                    if lowval in line.lower():
-                        c = line.strip()
-                        matches.setdefault(full, []).append((i, c))
-                        results.append({"path": full, "line": i, "code": c})
-            except Exception:
-                continue
-    return matches, results
-
-def with_context(path, lineno, ctx=3):
-    lines = open(path, encoding="utf-8", errors="ignore").read().splitlines()
-    s, e = max(1, lineno-ctx), min(len(lines), lineno+ctx)
-    return [(i, lines[i-1].rstrip()) for i in range(s, e+1)]
-
-def resolve_intent(q, intents):
-    m, score, _ = process.extractOne(q, intents)
-    return m if score >= 60 else None
-
-def get_staged_files(rp):
-    try:
-        repo = Repo(rp, search_parent_directories=True)
-        return [i.a_path for i in repo.index.diff("HEAD")]
-    except git_exc.InvalidGitRepositoryError:
-        print(f"{Fore.YELLOW}⚠️  Not a git repo, ignoring --staged{RESET}")
-        return None
-
-def get_blame(path, lineno):
-    try:
-        repo = Repo(path, search_parent_directories=True)
-        rel  = os.path.relpath(path, repo.working_tree_dir)
-        commit, _ = repo.blame("HEAD", rel)[lineno-1]
-        return commit, _
-    except Exception:
-        return None, None
-
-def stats(matches):
-    return {
-        "timestamp": str(datetime.datetime.now()),
-        "files":     len(matches),
-        "hits":      sum(len(v) for v in matches.values()),
-    }
-
-def export_report(data, fmt="markdown"):
-    if fmt == "json":
-        return json.dumps(data, indent=2)
-    if fmt == "html":
-        return (
-            "<html><body>"
-            f"<h1>mindgrep Report</h1>"
-            f"<ul><li>Time: {data['timestamp']}</li>"
-            f"<li>Files: {data['files']}</li>"
-            f"<li>Hits: {data['hits']}</li></ul>"
-            "</body></html>"
-        )
-    return (
-        f"**mindgrep Report**\n"
-        f"- Time: {data['timestamp']}\n"
-        f"- Files: {data['files']}\n"
-        f"- Hits:  {data['hits']}\n"
-    )
-
-def print_report(data, fmt="markdown"):
-    if fmt == "json":
-        print(export_report(data, "json"))
-    elif fmt == "html":
-        print(export_report(data, "html"))
-    else:
-        print(f"{STAT_HDR}mindgrep Report{RESET}")
-        print(f"{STAT_HDR}- Time:{RESET}  {STAT_VAL}{data['timestamp']}{RESET}")
-        print(f"{STAT_HDR}- Files:{RESET} {STAT_VAL}{data['files']}{RESET}")
-        print(f"{STAT_HDR}- Hits:{RESET}  {STAT_VAL}{data['hits']}{RESET}")
-
-
-def interactive_view(matches):
-    console = Console()
-    table   = Table(title="mindgrep Interactive")
-    table.add_column("Idx", justify="right")
-    table.add_column("File")
-    table.add_column("Line")
-    table.add_column("Code")
-
-    rows, idx = [], 1
-    for path, hits in matches.items():
-        for ln, code in hits:
-            table.add_row(str(idx), path, str(ln), code)
-            rows.append((path, ln))
-            idx += 1
-
-    console.print(table)
-    choice = console.input("Select index to open (ENTER to skip): ")
-    if not choice.isdigit():
-        return
-
-    sel = int(choice) - 1
-    if not (0 <= sel < len(rows)):
-        color_error("⚠️  Invalid selection")
-        return
-
-    fp, ln = rows[sel]
-    if os.name == "nt":
-        ed, args = os.environ.get("EDITOR", "notepad"), [fp]
-    else:
-        ed, args = os.environ.get("EDITOR", "vim"), [f"+{ln}", fp]
-
-    console.print(f"Opening {fp}:{ln} in {ed}")
-    try:
-        subprocess.run([ed] + args)
-    except FileNotFoundError:
-        color_error(f"⚠️  Editor '{ed}' not found.")
-
-def color_error(msg):
-    print(f"{Fore.RED}{Style.BRIGHT}{msg}{RESET}")
-
-def build_tree(matches, root):
-    tree = {}
-    for full_path, hits in matches.items():
-        lines = [ln for ln, _ in hits]
-        rel = os.path.relpath(full_path, root)
-        parts = rel.split(os.sep)
-
-        node = tree
-        for part in parts[:-1]:
-            node = node.setdefault(part, {})
-        node.setdefault(parts[-1], []).extend(lines)
-    return tree
-
-def print_tree(tree, prefix=""):
-    items = list(tree.items())
-    for i, (name, val) in enumerate(items):
-        last = (i == len(items) - 1)
-        conn = f"{CONN_COLOR}{'└──' if last else '├──'}{RESET}"
-        if isinstance(val, dict):
-            print(f"{prefix}{conn} {DIR_COLOR}{name}{os.sep}{RESET}")
-            print_tree(val, prefix + ("    " if last else "│   "))
-        else:
-            nums = ",".join(str(n) for n in sorted(val))
-            print(f"{prefix}{conn} {FILE_COLOR}{name}{RESET}:{LINE_COLOR}{nums}{RESET}")
-
-def output_table(matches):
-    rows = []
-    for p, hits in matches.items():
-        for ln, c in hits:
-            rows.append([p, ln, c])
-    if not rows:
-        print("(no matches)")
-        return
-    hdr = [STAT_HDR + h + RESET for h in ["Path", "Line", "Code"]]
-    clr = [[r[0], f"{STAT_VAL}{r[1]}{RESET}", f"{CODE_COLOR}{r[2]}{RESET}"] for r in rows]
-    print(tabulate(clr, headers=hdr, tablefmt="fancy_grid"))
-
-def main():
-    desc = """\
-MindGrep: Semantic-aware code search for any codebase.
-Intent-based AST search + text search + Git/blame + interactive TUI + stats & reports.
-
-Contoh:
-  --FN "main.py"    → exact match file “main.py”
-  -X "a.py,b.txt"   → kecualikan file a.py dan b.txt
-"""
-    parser = argparse.ArgumentParser(
-        prog="mindgrep",
-        description=desc,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    parser.add_argument("-V", "--value", metavar="VAL", help="plain-text search string")
-    parser.add_argument("-F", "--file", dest="file_ext", help="filter by file extension")
-    parser.add_argument("-N", "--name", dest="name_filter", help="filter by filename substring")
-    parser.add_argument("--FN", dest="file_name_exact", help='filter by exact filename, e.g. --FN "main.py"')
-    parser.add_argument("-X", "--exclude", dest="exclude", help='exclude comma-separated basenames, e.g. -X "a.py,b.txt"')
-    parser.add_argument("-P", "--path", dest="path", default=".", help="root folder to scan")
-    parser.add_argument("-T", "--table", action="store_true", help="styled table output")
-    parser.add_argument("-J", "--json", action="store_true", help="JSON output")
-    parser.add_argument("-C", "--context", type=int, default=0, help="show N context lines")
-    parser.add_argument("--staged", action="store_true", help="scan only git-staged files")
-    parser.add_argument("--blame", action="store_true", help="show git blame")
-    parser.add_argument("--stats", action="store_true", help="show summary stats")
-    parser.add_argument("--report", choices=["markdown","html","json"], help="export stats report")
-    parser.add_argument("--interactive", action="store_true", help="interactive TUI mode")
-    parser.add_argument("--intent-list", action="store_true", help="list all supported intents")
-    parser.add_argument("--theme", choices=["light","dark"], default="light", help="color theme")
-    parser.add_argument("intent", nargs="?", help="intent name (ignored if -V used)")
-    args = parser.parse_args()
-
-    # prepare exclude list
-    exclude_list = []
-    if args.exclude:
-        exclude_list = [e.strip() for e in args.exclude.split(",") if e.strip()]
-
-    args.path = os.path.expanduser(args.path)
-    apply_theme(args.theme)
-    plugins = load_plugins()
-
-    # mode list-files only
-    if not args.intent and not args.value and (
-       args.file_ext or args.name_filter or args.file_name_exact
-    ):
-        found = []
-        ext = args.file_ext.lstrip(".").lower() if args.file_ext else None
-        for dp, _, files in os.walk(args.path):
-            for fn in files:
-                if fn in exclude_list:
-                    continue
-                if args.file_name_exact and fn != args.file_name_exact:
-                    continue
-                low = fn.lower()
-                if ext and not low.endswith(f".{ext}"):
-                    continue
-                if args.name_filter and args.name_filter.lower() not in low:
-                    continue
-                found.append(os.path.join(dp, fn))
-        if not found:
-            color_error("⚠️  No files matched your criteria!")
-            sys.exit(0)
-        tree = {}
-        for f in sorted(found):
-            rel = os.path.relpath(f, args.path)
-            parts = rel.split(os.sep)
-            node = tree
-            for p in parts[:-1]:
-                node = node.setdefault(p, {})
-            node.setdefault(parts[-1], [])
-        print(f"{DIR_COLOR}{os.path.abspath(args.path)}{os.sep}{RESET}")
-        print_tree(tree)
-        sys.exit(0)
-
-    # list intents
-    if args.intent_list:
-        print("Supported intents:")
-        for i in sorted(INTENT_PATTERNS):
-            print("  -", i)
-        sys.exit(0)
-
-    root = args.path
-    staged = get_staged_files(os.getcwd()) if args.staged else None
-
-    # search
-    if args.value:
-        matches, results = search_value(
-            args.value, root,
-            args.file_ext, args.name_filter, args.file_name_exact
-        )
-    else:
-        if not args.intent:
-            parser.print_help(); sys.exit(1)
-        q = args.intent.lower()
-        intent = ALIAS_MAP.get(q) or resolve_intent(q, list(INTENT_PATTERNS))
-        if not intent:
-            color_error(f"⚠️  Intent `{args.intent}` not found")
-            sys.exit(1)
-        matches, results = find_intent_matches(
-            intent, root,
-            args.file_ext, args.name_filter, args.file_name_exact
-        )
-
-    # staged filter
-    if staged is not None:
-        matches = {p: h for p, h in matches.items() if os.path.relpath(p, root) in staged}
-        results = [r for r in results if r["path"] in matches]
-
-    # apply exclude
-    if exclude_list:
-        matches = {p:h for p,h in matches.items() if os.path.basename(p) not in exclude_list}
-        results = [r for r in results if os.path.basename(r["path"]) not in exclude_list]
-
-    if not matches:
-        if args.json:
-            print("[]")
-        else:
-            color_error("⚠️  No files matched your criteria!")
-        sys.exit(0)
-
-    if args.context:
-        ctx = {}
-        for p, hits in matches.items():
-            ctx[p] = []
-            for ln, _ in hits:
-                ctx[p].extend(with_context(p, ln, args.context))
-        matches = ctx
-        results = [{"path": p, "line": ln, "code": c} for p, h in ctx.items() for ln, c in h]
-
-    if args.blame:
-        for r in results:
-            commit, _ = get_blame(r["path"], r["line"])
-            if commit:
-                r["blame"] = {"commit": commit.hexsha, "author": commit.author.name}
-
-    if args.stats:
-        s = stats(matches)
-        if args.json:
-            print(json.dumps(s, indent=2))
-        else:
-            fmt = args.report or "markdown"
-            print_report(s, fmt)
-        sys.exit(0)
-
-    if args.interactive:
-        interactive_view(matches)
-        sys.exit(0)
-
-    # final output
-    if args.json:
-        print(json.dumps(results, indent=2))
-    elif args.table:
-        output_table(matches)
-    else:
-        print(f"{DIR_COLOR}{os.path.abspath(root)}{os.sep}{RESET}")
-        tree = build_tree(matches, root)
-        print_tree(tree)
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+import os
+import sys
+import ast
+import csv
+import json
+import re
+import struct
+import sqlite3
+import pathlib
+import contextlib
+import functools
+import argparse
+import subprocess
+import datetime
+import time
+import hashlib
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from importlib import util as importlib_util
+from typing import NamedTuple, Optional
+
+from colorama import init, Fore, Style, initialise as colorama_init
+from colorama.ansitowin32 import StreamWrapper
+from tabulate import tabulate
+from rapidfuzz import process
+from git import Repo, exc as git_exc
+from rich.console import Console
+from rich.table import Table
+
+# ──────────────────────────────────────────────────
+init(autoreset=True)
+RESET = Style.RESET_ALL
+
+# ─── INTENT PATTERNS & ALIASES ───────────────────────────────────────────────
+INTENT_PATTERNS = {
+    "http request": [
+        "requests.get", "requests.post", "requests.put", "requests.delete",
+        "requests.head", "requests.options", "requests.patch",
+        "requests.Session", "requests.request",
+        "urllib.request.urlopen", "urllib3.PoolManager.request",
+        "http.client.HTTPConnection", "http.client.HTTPSConnection",
+        "httpx.get", "httpx.post", "httpx.put", "httpx.delete", "httpx.request",
+        "aiohttp.ClientSession.get", "aiohttp.ClientSession.post", "aiohttp.request",
+        "tornado.httpclient.AsyncHTTPClient.fetch",
+        "tornado.httpclient.HTTPClient.fetch",
+    ],
+    "file encryption": [
+        "cryptography.fernet.Fernet", "Fernet(",
+        "AES.new", "Crypto.Cipher.AES.new",
+        "Crypto.Cipher.ChaCha20.new", "ChaCha20Poly1305.new",
+        "hashlib.md5", "hashlib.sha256", "hashlib.sha512", "hashlib.blake2b",
+        "hmac.new", "hashlib.pbkdf2_hmac", "scrypt",
+        "rsa.encrypt", "RSA.import_key", "Crypto.PublicKey.RSA.generate",
+    ],
+    "shell exec": [
+        "os.system", "os.popen", "subprocess.run", "subprocess.Popen",
+        "subprocess.call", "subprocess.check_output", "subprocess.check_call",
+        "commands.getoutput",
+        "pexpect.spawn", "shlex.split", "fabric.Connection", "paramiko.SSHClient",
+    ],
+    # argument-constrained variants of the broader intents above, kept separate
+    # so the constraint decides the match instead of a name-only pattern
+    "unsafe shell": [
+        "subprocess.Popen(shell=True", "subprocess.run(shell=True",
+        "subprocess.call(shell=True", "subprocess.check_output(shell=True",
+        "subprocess.check_call(shell=True", "os.system", "os.popen",
+    ],
+    "insecure tls": [
+        "requests.get(verify=False", "requests.post(verify=False",
+        "requests.put(verify=False", "requests.delete(verify=False",
+        "requests.patch(verify=False", "requests.request(verify=False",
+        "httpx.get(verify=False", "httpx.post(verify=False",
+        "httpx.Client(verify=False", "httpx.AsyncClient(verify=False",
+        "ssl._create_unverified_context", "urllib3.disable_warnings",
+    ],
+    "database access": [
+        "sqlite3.connect", "psycopg2.connect", "pymysql.connect",
+        "mysql.connector.connect", "sqlalchemy.create_engine",
+        "cursor.execute", "engine.execute", "pymongo.MongoClient", "redis.Redis",
+        "motor.motor_asyncio.AsyncIOMotorClient",
+        "boto3.resource('dynamodb')", "boto3.client('dynamodb')",
+        "boto3.resource(service_name='dynamodb')", "boto3.client(service_name='dynamodb')",
+        "neo4j.GraphDatabase.driver", "elasticsearch.Elasticsearch",
+    ],
+    "file io": [
+        "open(", "Path.open(", "Path.write_text", "Path.read_text",
+        "os.remove", "os.unlink", "os.rename",
+        "os.mkdir", "os.makedirs", "shutil.copy", "shutil.move",
+        "shutil.rmtree", "tempfile.NamedTemporaryFile",
+        "tempfile.TemporaryDirectory", "glob.glob", "os.walk",
+    ],
+    "json": [
+        "json.load", "json.loads", "json.dump", "json.dumps",
+        "simplejson.loads", "simplejson.dumps",
+        "ujson.loads", "ujson.dumps",
+    ],
+    "xml": [
+        "xml.etree.ElementTree.parse", "xml.etree.ElementTree.fromstring",
+        "lxml.etree.parse", "lxml.objectify.fromstring",
+        "xml.dom.minidom.parseString", "xml.sax.make_parser",
+        "bs4.BeautifulSoup", "BeautifulSoup(",
+    ],
+    "yaml": [
+        "yaml.safe_load", "yaml.load", "yaml.FullLoader", "yaml.RoundTripLoader",
+        "ruamel.yaml.YAML().load", "ruamel.yaml.round_trip_load",
+    ],
+    "csv": [
+        "csv.reader", "csv.writer", "csv.DictReader", "csv.DictWriter",
+        "pandas.read_csv", "pandas.DataFrame.to_csv",
+        "numpy.loadtxt", "numpy.savetxt",
+    ],
+    "regex": [
+        "re.search", "re.match", "re.findall", "re.sub", "re.compile",
+        "regex.search", "regex.match",
+    ],
+    "logging": [
+        "logging.debug", "logging.info", "logging.warning",
+        "logging.error", "logging.critical", "logger.log",
+        "print(", "warnings.warn", "sys.stderr.write",
+    ],
+    "threading": [
+        "threading.Thread", "concurrent.futures.ThreadPoolExecutor",
+        "concurrent.futures.ProcessPoolExecutor",
+        "multiprocessing.Process", "multiprocessing.Pool",
+        "multiprocessing.dummy.Pool",
+    ],
+    "async tasks": [
+        "asyncio.create_task", "asyncio.run", "asyncio.gather",
+        "asyncio.ensure_future", "trio.run", "curio.run", "anyio.run",
+    ],
+    "socket": [
+        "socket.socket", "socket.bind", "socket.listen", "socket.connect",
+        "ssl.wrap_socket", "ssl.SSLContext", "asyncio.open_connection",
+        "asyncio.start_server", "websockets.connect", "websockets.serve",
+    ],
+    "http server": [
+        "http.server.HTTPServer", "http.server.SimpleHTTPRequestHandler",
+        "flask.Flask", "FastAPI(", "django.urls", "Sanic(",
+        "bottle.Bottle", "tornado.web.Application", "aiohttp.web.Application",
+    ],
+    "compression": [
+        "zipfile.ZipFile", "tarfile.open", "gzip.open",
+        "bz2.BZ2File", "lzma.open", "shutil.make_archive",
+        "patoolib.extract_archive",
+    ],
+    "image processing": [
+        "PIL.Image.open", "PIL.Image.save", "cv2.imread", "cv2.imwrite",
+        "cv2.VideoCapture", "skimage.io.imread", "skimage.io.imsave",
+        "Image.fromarray", "matplotlib.pyplot.imshow",
+    ],
+    "cli parsing": [
+        "argparse.ArgumentParser", "click.command", "typer.Typer",
+        "optparse.OptionParser", "docopt.docopt", "sys.argv",
+    ],
+    "caching": [
+        "functools.lru_cache", "cachetools.Cache", "django.core.cache",
+        "redis_cache.Cache", "dogpile.cache", "memcache.Client",
+    ],
+    "email sending": [
+        "smtplib.SMTP", "smtplib.SMTP_SSL",
+        "email.mime.text.MIMEText", "EmailMessage",
+        "yagmail.SMTP", "send_email",
+    ],
+    "validation": [
+        "pydantic.BaseModel", "validate_email", "cerberus.Validator",
+        "marshmallow.Schema", "jsonschema.validate",
+    ],
+    "authentication": [
+        "jwt.encode", "jwt.decode", "pyjwt.decode",
+        "werkzeug.security", "bcrypt.hashpw", "bcrypt.checkpw",
+    ],
+    "error handling": [
+        "try:", "except", "finally:", "raise", "assert", "logging.exception",
+    ],
+}
+
+INTENT_ALIASES = {
+    "http request":       ["http", "url", "req", "request", "httpx", "urllib"],
+    "file encryption":    ["encrypt", "crypto", "AES", "Fernet", "KDF", "hash"],
+    "shell exec":         ["shell", "exec", "bash", "sh", "system", "cmd", "subprocess"],
+    "unsafe shell":       ["shell=true", "injection", "unsafe"],
+    "insecure tls":       ["tls", "verify", "insecure", "certificate", "cert"],
+    "database access":    ["database", "db", "sql", "nosql", "mongo", "redis"],
+    "file io":            ["file", "io", "fs", "filesystem", "path", "read", "write"],
+    "json":               ["json", "serialize", "deserialize", "simplejson", "ujson"],
+    "xml":                ["xml", "xslt", "dom", "sax", "beautifulsoup", "bs4", "lxml"],
+    "yaml":               ["yaml", "yml", "config", "settings", "ruamel"],
+    "csv":                ["csv", "table", "spreadsheet", "tsv", "pandas", "numpy"],
+    "regex":              ["regex", "re", "pattern", "regexp"],
+    "logging":            ["log", "logger", "warning", "error", "print"],
+    "threading":          ["thread", "threads", "parallel", "multiprocessing"],
+    "async tasks":        ["async", "asyncio", "trio", "curio", "anyio"],
+    "socket":             ["socket", "ssl", "websocket", "tcp", "udp"],
+    "http server":        ["server", "flask", "fastapi", "django", "sanic", "bottle"],
+    "compression":        ["zip", "tar", "gzip", "bz2", "lzma", "archive", "compress"],
+    "image processing":   ["image", "pil", "opencv", "cv2", "skimage", "matplotlib"],
+    "cli parsing":        ["cli", "argparse", "click", "typer", "optparse", "docopt"],
+    "caching":            ["cache", "caching", "lru", "redis", "memcache", "dogpile"],
+    "email sending":      ["email", "smtp", "mail", "yagmail", "messaging"],
+    "validation":         ["validate", "schema", "pydantic", "cerberus", "marshmallow", "jsonschema"],
+    "authentication":     ["auth", "jwt", "oauth", "token", "login", "bcrypt"],
+    "error handling":     ["error", "exception", "assert", "raise", "try", "catch"],
+}
+
+ALIAS_MAP = {
+    alias.lower(): intent
+    for intent, aliases in INTENT_ALIASES.items()
+    for alias in aliases
+}
+
+THEMES = {
+    "light": {
+        "dir":      Fore.CYAN + Style.BRIGHT,
+        "file":     Fore.GREEN + Style.BRIGHT,
+        "line":     Fore.YELLOW,
+        "code":     Fore.WHITE,
+        "conn":     Fore.MAGENTA,
+        "stat_hdr": Fore.CYAN + Style.BRIGHT,
+        "stat_val": Fore.YELLOW,
+    },
+    "dark": {
+        "dir":      Fore.BLUE + Style.BRIGHT,
+        "file":     Fore.WHITE + Style.BRIGHT,
+        "line":     Fore.MAGENTA,
+        "code":     Fore.WHITE,
+        "conn":     Fore.YELLOW,
+        "stat_hdr": Fore.CYAN + Style.BRIGHT,
+        "stat_val": Fore.YELLOW,
+    },
+}
+
+DIR_COLOR = FILE_COLOR = LINE_COLOR = CODE_COLOR = CONN_COLOR = ""
+STAT_HDR = STAT_VAL = ""
+
+def apply_theme(name: str):
+    global DIR_COLOR, FILE_COLOR, LINE_COLOR, CODE_COLOR, CONN_COLOR, STAT_HDR, STAT_VAL
+    th = THEMES.get(name, THEMES["light"])
+    DIR_COLOR, FILE_COLOR = th["dir"], th["file"]
+    LINE_COLOR, CODE_COLOR = th["line"], th["code"]
+    CONN_COLOR = th["conn"]
+    STAT_HDR, STAT_VAL = th["stat_hdr"], th["stat_val"]
+
+def load_plugins():
+    plugins = {}
+    pd = os.path.join(os.path.dirname(__file__), "plugins")
+    if os.path.isdir(pd):
+        for fn in sorted(os.listdir(pd)):
+            if fn.endswith(".py"):
+                spec = importlib_util.spec_from_file_location(fn, os.path.join(pd, fn))
+                mod  = importlib_util.module_from_spec(spec)
+                spec.loader.exec_module(mod)
+                plugins[fn[:-3]] = mod
+    return plugins
+
+def get_full_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        p = get_full_name(node.value)
+        return f"{p}.{node.attr}" if p else None
+    if isinstance(node, ast.Call):
+        # chained calls: ruamel.yaml.YAML().load -> "ruamel.yaml.YAML().load"
+        p = get_full_name(node.func)
+        return f"{p}()" if p else None
+    return None
+
+# ─── PATTERN COMPILER ────────────────────────────────────────────────────────
+_ANY = object()
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern):
+    """Split an intent pattern into its lookup name and an optional call check.
+
+    ``"requests.get"`` and ``"open("`` are name-only. Argument lists add
+    structural predicates: ``"subprocess.Popen(shell=True"`` needs that
+    keyword value, ``"boto3.client('dynamodb')"`` that positional literal,
+    ``"ruamel.yaml.YAML().load"`` a chained call. Listed arguments are a
+    minimum (other args may follow), ``...`` or a bare name accepts any
+    value, and the closing parenthesis may be omitted. Positional and
+    keyword forms are matched separately: ``boto3.client('dynamodb')`` does
+    not match ``boto3.client(service_name='dynamodb')``, so list both when
+    both spellings matter. Patterns that are not call expressions
+    (``"try:"``) are kept verbatim and never match.
+
+    Within one intent the first pattern that passes wins, so a constraint
+    only narrows results when no name-only pattern for the same call sits
+    in that intent (see ``"unsafe shell"`` next to ``"shell exec"``).
+
+    Returns ``(name, check)``; ``check(call_node)`` is None when the name
+    alone decides, and is only run on calls whose name already matched.
+    """
+    src = pattern.strip()
+    try:
+        expr = ast.parse(src + ")" * max(src.count("(") - src.count(")"), 0), mode="eval").body
+    except SyntaxError:
+        return pattern, None
+    # a Call pattern describes the call itself; anything else is its callee
+    name = get_full_name(expr.func if isinstance(expr, ast.Call) else expr)
+    if not name:
+        return pattern, None
+    steps = [] if isinstance(expr, ast.Call) else [((), {})]
+    node = expr
+    while not isinstance(node, ast.Name):
+        if isinstance(node, ast.Call):
+            steps.append((
+                tuple(_pattern_value(a) for a in node.args),
+                {k.arg: _pattern_value(k.value) for k in node.keywords if k.arg},
+            ))
+            node = node.func
+        else:
+            steps.append(None)
+            node = node.value
+    while steps and steps[-1] in (None, ((), {})):
+        steps.pop()
+    return name, (functools.partial(_check_call, tuple(steps)) if steps else None)
+
+def _pattern_value(node):
+    try:
+        v = ast.literal_eval(node)
+    except Exception:
+        return _ANY
+    return _ANY if v is Ellipsis else v
+
+def _literal_is(node, want):
+    try:
+        v = ast.literal_eval(node)
+    except Exception:
+        return False
+    return type(v) is type(want) and v == want
+
+def _check_call(steps, node):
+    """Walk the callee chain of ``node`` alongside the compiled ``steps``."""
+    for step in steps:
+        if step is None:
+            node = node.value
+            continue
+        if not isinstance(node, ast.Call):
+            return False
+        pos, kws = step
+        if len(node.args) < len(pos):
+            return False
+        for want, got in zip(pos, node.args):
+            if want is not _ANY and not _literal_is(got, want):
+                return False
+        if kws:
+            have = {k.arg: k.value for k in node.keywords if k.arg}
+            for k, want in kws.items():
+                if k not in have or (want is not _ANY and not _literal_is(have[k], want)):
+                    return False
+        node = node.func
+    return True
+
+def _compile_matcher(pairs):
+    """``{call name: ((intent, check), ...)}`` from ``(intent, pattern)`` pairs."""
+    m = {}
+    for intent, pat in pairs:
+        name, check = compile_pattern(pat)
+        entries = m.setdefault(name, [])
+        if (intent, check) not in entries:
+            entries.append((intent, check))
+    return {k: tuple(v) for k, v in m.items()}
+
+def scan_file_ast(fp, patterns):
+    matcher = _compile_matcher((None, p) for p in patterns)
+    scanner = Scanner(cache=False)
+    scanner._checked = {nm for nm, entries in matcher.items() if any(c for _, c in entries)}
+    src = scanner._source(fp)
+    if src is None:
+        return []
+    return [(h.line, h.code) for h in scanner._scan_file(fp, src, matcher)]
+
+# ─── LIBRARY API ─────────────────────────────────────────────────────────────
+class Hit(NamedTuple):
+    """One match: file path, 1-based line number and the stripped source line.
+
+    ``chain`` is only set by transitive searches: the qualified names from the
+    reporting function down to the matched pattern.
+    """
+    path: str
+    line: int
+    code: str
+    intent: Optional[str] = None
+    chain: tuple = ()
+
+    def to_dict(self):
+        d = {"path": self.path, "line": self.line, "code": self.code}
+        if self.chain:
+            d["chain"] = list(self.chain)
+        return d
+
+class _SourceFile:
+    """Cached contents of one file, valid while its (mtime, size) stamp holds."""
+    __slots__ = ("stamp", "digest", "text", "_lines", "calls", "funcs")
+
+    def __init__(self, stamp, data):
+        self.stamp  = stamp
+        self.digest = hashlib.blake2b(data, digest_size=16).digest()
+        # same result as text-mode open(): utf-8, errors ignored, universal newlines
+        self.text   = (data.decode("utf-8", errors="ignore")
+                       .replace("\r\n", "\n").replace("\r", "\n"))
+        self._lines = None
+        self.calls  = None
+        self.funcs  = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            lines = self.text.split("\n")
+            if lines and not lines[-1]:
+                lines.pop()
+            self._lines = lines
+        return self._lines
+
+class Scanner:
+    """Reusable, embeddable search engine; the CLI is a thin layer over it.
+
+    Configure it once with roots, intents and filters, then call :meth:`scan`
+    (intent-based AST search) or :meth:`search` (plain-text search) as often
+    as needed. Both return lazy iterators of :class:`Hit`. Parsed files,
+    compiled intent matchers and git handles stay warm between calls; cached
+    files are revalidated against their mtime and size before reuse, and the
+    cache is bounded by ``max_cached_files`` and ``max_cached_bytes``.
+
+    Within one run, hard links and symlinks to an already-seen file (same
+    device and inode) and byte-identical copies (same content hash) are read
+    and matched once; their hits are re-emitted under every path. Counts are
+    kept in :attr:`stats`, which is reset at the start of each run.
+
+    With ``io_threads > 0`` a run is pipelined: that many threads read files
+    ahead of the matcher, holding at most ``prefetch_bytes`` of unconsumed
+    contents (or one file larger than that), and ``stats["io_wait"]`` records how long matching
+    sat idle waiting for them. Hits are still produced in walk order.
+
+        scanner = Scanner("src", intents=["http", "shell"], file_ext="py")
+        for hit in scanner.scan():
+            print(hit.path, hit.line, hit.code)
+    """
+
+    def __init__(self, roots=".", intents=None, file_ext=None, name_filter=None,
+                 file_name_exact=None, exclude=None, staged=False,
+                 cache=True, max_cached_files=4096, max_cached_bytes=64 << 20,
+                 dedupe=True, follow_links=False,
+                 io_threads=0, prefetch_bytes=64 << 20):
+        if isinstance(roots, (str, os.PathLike)):
+            roots = [roots]
+        self.roots            = [os.path.expanduser(os.fspath(r)) for r in roots]
+        self.intents          = self._resolve_all(intents)
+        self.file_ext         = file_ext.lstrip(".").lower() if file_ext else None
+        self.name_filter      = name_filter.lower() if name_filter else None
+        self.file_name_exact  = file_name_exact
+        self.exclude          = set(exclude or ())
+        self.staged           = staged
+        self.cache            = cache
+        self.max_cached_files = max_cached_files
+        self.max_cached_bytes = max_cached_bytes
+        self.dedupe           = dedupe
+        self.follow_links     = follow_links
+        self.io_threads       = io_threads
+        self.prefetch_bytes   = prefetch_bytes
+        self.stats            = self._new_stats()
+        self._files    = OrderedDict()
+        self._cached_bytes = 0
+        self._matchers = {}
+        self._repos    = {}
+        self._blames   = {}
+        self._graph    = None
+        # names whose patterns inspect arguments; only their call nodes are kept
+        self._checked  = {
+            nm for nm, entries in _compile_matcher(
+                (i, p) for i, pats in INTENT_PATTERNS.items() for p in pats).items()
+            if any(c for _, c in entries)
+        }
+
+    # ── queries ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def resolve(query):
+        """Map an intent name, alias or near-miss spelling to its canonical name."""
+        if query in INTENT_PATTERNS:
+            return query
+        q = query.lower()
+        intent = ALIAS_MAP.get(q) or resolve_intent(q, list(INTENT_PATTERNS))
+        if not intent:
+            raise ValueError(f"Intent `{query}` not found")
+        return intent
+
+    @classmethod
+    def _resolve_all(cls, intents):
+        if not intents:
+            return []
+        if isinstance(intents, str):
+            intents = [intents]
+        return [cls.resolve(i) for i in intents]
+
+    def scan(self, intents=None):
+        """Yield a :class:`Hit` for every call matching one of ``intents``."""
+        intents = self._resolve_all(intents) or self.intents
+        if not intents:
+            raise ValueError("no intents to scan for")
+        matcher = self._matcher(tuple(intents))
+        return self._scan(matcher)
+
+    def scan_file(self, path, intents=None):
+        """Like :meth:`scan`, restricted to a single file (filters are not applied)."""
+        intents = self._resolve_all(intents) or self.intents
+        if not intents:
+            raise ValueError("no intents to scan for")
+        src = self._source(path)
+        if src is None:
+            return iter(())
+        return self._scan_file(path, src, self._matcher(tuple(intents)))
+
+    def search(self, value):
+        """Yield a :class:`Hit` for every line containing ``value`` (case-insensitive)."""
+        if not value:
+            raise ValueError("empty search value")
+        return self._search(value.lower())
+
+    def iter_files(self, py_only=False):
+        """Yield every file under the roots that passes the configured filters."""
+        staged = self.staged_files() if self.staged else None
+        for full in self._walk():
+            if not self._accepts(os.path.basename(full), py_only):
+                continue
+            if staged is not None and os.path.abspath(full) not in staged:
+                continue
+            yield full
+
+    def _accepts(self, fn, py_only=False):
+        if fn in self.exclude:
+            return False
+        if self.file_name_exact and fn != self.file_name_exact:
+            return False
+        low = fn.lower()
+        if self.file_ext and not low.endswith(f".{self.file_ext}"):
+            return False
+        if self.name_filter and self.name_filter not in low:
+            return False
+        return not py_only or low.endswith(".py")
+
+    def _walk(self):
+        """Every file under the roots, each directory visited once, unfiltered."""
+        seen_dirs = set()
+        for root in self.roots:
+            for dp, dirs, files in os.walk(root, followlinks=self.follow_links):
+                # never descend into the same directory twice (overlapping
+                # roots, symlink loops when following links)
+                try:
+                    st = os.stat(dp)
+                except OSError:
+                    dirs[:] = []
+                    continue
+                if st.st_ino:
+                    key = (st.st_dev, st.st_ino)
+                    if key in seen_dirs:
+                        dirs[:] = []
+                        continue
+                    seen_dirs.add(key)
+                dirs.sort()
+                for fn in sorted(files):
+                    yield os.path.join(dp, fn)
+
+    def query(self, expr):
+        """Yield hits for a boolean query expression (see :class:`Query`)."""
+        q = expr if isinstance(expr, Query) else Query(expr)
+        return self._run(
+            self.iter_files(),
+            lambda path, src: q.file_hits(self, path, src),
+            keep=q.keep, key=q.key,
+        )
+
+    def transitive(self, intents=None, hops=3, index_path=None):
+        """Yield one hit per function that reaches an intent within ``hops`` calls.
+
+        Uses the persistent :class:`CallGraphIndex` (updated incrementally
+        first). Each hit points at the call site inside the reporting
+        function and carries the call chain; the configured filename filters
+        apply to the reported files, not to the graph.
+        """
+        intents = self._resolve_all(intents) or self.intents
+        if not intents:
+            raise ValueError("no intents to scan for")
+        path = index_path or CallGraphIndex.default_path(self.roots)
+        if self._graph is None or self._graph.path != path:
+            if self._graph is not None:
+                self._graph.close()
+            self._graph = CallGraphIndex(path)
+        self._graph.update(self)
+        # the index keeps names only, so argument-constrained patterns are
+        # followed only where the same name also has a name-only pattern
+        names = {
+            nm: next(i for i, check in entries if check is None)
+            for nm, entries in self._matcher(tuple(intents)).items()
+            if any(check is None for _, check in entries)
+        }
+        reached = self._graph.reaching(names, hops)
+        return self._transitive(reached)
+
+    def _transitive(self, reached):
+        for qualname, (path, line, chain, intent) in sorted(
+            reached.items(), key=lambda kv: (kv[1][0], kv[1][1], kv[0])
+        ):
+            if not self._accepts(os.path.basename(path), py_only=True):
+                continue
+            src = self._source(path)
+            if src is None or not 0 < line <= len(src.lines):
+                continue
+            yield Hit(path, line, src.lines[line-1].strip(), intent, chain)
+
+    def context(self, path, lineno, ctx=3):
+        """Return ``(line, text)`` pairs for ``ctx`` lines around ``lineno``."""
+        src = self._source(path)
+        if src is None:
+            return []
+        lines = src.lines
+        s, e = max(1, lineno-ctx), min(len(lines), lineno+ctx)
+        return [(i, lines[i-1].rstrip()) for i in range(s, e+1)]
+
+    # ── git ──────────────────────────────────────────────────────────────────
+    def repo(self, path=None):
+        """Return the cached git ``Repo`` containing ``path``, or None."""
+        path = path or self.roots[0]
+        d = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+        if d not in self._repos:
+            try:
+                self._repos[d] = Repo(d, search_parent_directories=True)
+            except (git_exc.InvalidGitRepositoryError, git_exc.NoSuchPathError):
+                self._repos[d] = None
+        return self._repos[d]
+
+    def staged_files(self):
+        """Absolute paths staged in the first root's repository, or None."""
+        repo = self.repo()
+        if repo is None:
+            return None
+        top = repo.working_tree_dir
+        return {os.path.abspath(os.path.join(top, d.a_path)) for d in repo.index.diff("HEAD")}
+
+    def blame(self, path, lineno):
+        """Return the commit that last touched ``path:lineno`` at HEAD, or None."""
+        repo = self.repo(path)
+        if repo is None:
+            return None
+        full = os.path.abspath(path)
+        try:
+            key = (full, repo.head.commit.hexsha)
+        except ValueError:
+            return None
+        commits = self._blames.get(key)
+        if commits is None:
+            try:
+                rel = os.path.relpath(full, repo.working_tree_dir)
+                commits = [c for c, lines in repo.blame("HEAD", rel) for _ in lines]
+            except Exception:
+                commits = []
+            self._blames[key] = commits
+        return commits[lineno-1] if 0 < lineno <= len(commits) else None
+
+    def clear_cache(self):
+        if self._graph is not None:
+            self._graph.close()
+            self._graph = None
+        self._files.clear()
+        self._cached_bytes = 0
+        self._matchers.clear()
+        self._repos.clear()
+        self._blames.clear()
+
+    # ── internals ────────────────────────────────────────────────────────────
+    def _matcher(self, intents):
+        """``{call name: ((intent, check), ...)}`` for the given intents."""
+        m = self._matchers.get(intents)
+        if m is None:
+            m = self._matchers[intents] = _compile_matcher(
+                (i, p) for i in intents for p in INTENT_PATTERNS[i])
+        return m
+
+    def _source(self, path, st=None):
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        src = self._files.get(path)
+        if src is not None and src.stamp == stamp:
+            self._files.move_to_end(path)
+            return src
+        src = self._read(path, stamp)
+        if src is not None:
+            self._remember(path, src)
+        return src
+
+    @staticmethod
+    def _read(path, stamp):
+        try:
+            # unbuffered: a single bulk read sized from fstat
+            with open(path, "rb", buffering=0) as fh:
+                return _SourceFile(stamp, fh.read())
+        except OSError:
+            return None
+
+    def _remember(self, path, src):
+        if not self.cache:
+            return
+        old = self._files.pop(path, None)
+        if old is not None:
+            self._cached_bytes -= old.stamp[1]
+        self._files[path] = src
+        self._cached_bytes += src.stamp[1]
+        while self._files and (len(self._files) > self.max_cached_files
+                               or self._cached_bytes > self.max_cached_bytes):
+            _, old = self._files.popitem(last=False)
+            self._cached_bytes -= old.stamp[1]
+
+    def _prefetch(self, path, st):
+        """I/O-thread read: the file's contents, or None if the cache is valid."""
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return None
+        return self._read(path, stamp)
+
+    def _load(self, paths):
+        """Yield ``(path, stat, src)``; ``src`` is None when not read ahead."""
+        if self.io_threads <= 0:
+            for path in paths:
+                try:
+                    yield path, os.stat(path), None
+                except OSError:
+                    continue
+            return
+        stats = self.stats
+        stats["io_wait"] = 0.0
+        budget = max(self.prefetch_bytes, 1)
+        max_inflight = self.io_threads * 4
+        pending, owners = deque(), {}
+        held, staged = 0, None
+
+        def wait(fut):
+            if fut.done():
+                return fut.result()
+            t0 = time.perf_counter()
+            res = fut.result()
+            stats["io_wait"] += time.perf_counter() - t0
+            return res
+
+        paths = iter(paths)
+        with ThreadPoolExecutor(self.io_threads, thread_name_prefix="mindgrep-io") as pool:
+            try:
+                while True:
+                    # stat here and reserve st_size before a read is submitted,
+                    # so reads in flight plus reads not yet consumed stay within
+                    # the budget; one file always goes through when none is held
+                    while len(pending) < max_inflight:
+                        if staged is None:
+                            path = next(paths, None) if paths is not None else None
+                            if path is None:
+                                paths = None
+                                break
+                            try:
+                                staged = path, os.stat(path)
+                            except OSError:
+                                continue
+                        path, st = staged
+                        if self.dedupe and st.st_ino:
+                            # one read per (device, inode): links defer to the first claimant
+                            owner = owners.setdefault((st.st_dev, st.st_ino), path)
+                            if owner != path:
+                                pending.append((path, st, None))
+                                staged = None
+                                continue
+                        if held and held + st.st_size > budget:
+                            break
+                        held += st.st_size
+                        pending.append((path, st, pool.submit(self._prefetch, path, st)))
+                        staged = None
+                    if not pending:
+                        return
+                    path, st, fut = pending.popleft()
+                    if fut is not None:
+                        src = wait(fut)
+                        held -= st.st_size
+                        if src is not None:
+                            self._remember(path, src)
+                    else:
+                        # the claimant was consumed first; reuse its cached read
+                        src = self._files.get(owners[(st.st_dev, st.st_ino)])
+                        if src is not None and src.stamp != (st.st_mtime_ns, st.st_size):
+                            src = None
+                    yield path, st, src
+            finally:
+                for _, _, fut in pending:
+                    if fut is not None:
+                        fut.cancel()
+
+    def _calls(self, path, src):
+        if src.calls is None:
+            self._parse(path, src)
+        return src.calls
+
+    def _funcs(self, path, src):
+        """``(first, last)`` line spans of every function defined in ``src``."""
+        if src.funcs is None:
+            self._parse(path, src)
+        return src.funcs
+
+    def _parse(self, path, src):
+        try:
+            tree = ast.parse(src.text, filename=path)
+        except Exception:
+            src.calls, src.funcs = (), ()
+            return
+        # cache (name, line) only; holding every Call node would pin the
+        # whole tree of each cached file in memory
+        calls, funcs, checked = [], [], self._checked
+        for n in ast.walk(tree):
+            if isinstance(n, ast.Call):
+                nm = get_full_name(n.func)
+                calls.append((nm, n.lineno, n if nm in checked else None))
+            elif isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                end = getattr(n, "end_lineno", None) or max(
+                    getattr(c, "lineno", n.lineno) for c in ast.walk(n))
+                funcs.append((n.lineno, end))
+        src.calls, src.funcs = calls, funcs
+
+    @staticmethod
+    def _new_stats():
+        return {"files": 0, "dup_inode": 0, "dup_content": 0}
+
+    def _run(self, paths, file_hits, keep=None, key=None):
+        """Drive ``file_hits(path, src)`` over ``paths``, deduplicating bodies.
+
+        ``keep(path)`` can reject a path before it is read; when the hits
+        depend on the path as well as the content, ``key(path)`` extends the
+        dedupe key so only paths with the same key share results.
+        """
+        stats = self.stats = self._new_stats()
+        by_inode, by_digest = {}, {}
+        if keep is not None:
+            paths = (p for p in paths if keep(p))
+        for path, st, src in self._load(paths):
+            extra = key(path) if key is not None else None
+            ino = (st.st_dev, st.st_ino, extra) if self.dedupe and st.st_ino else None
+            hits = by_inode.get(ino) if ino else None
+            if hits is not None:
+                stats["dup_inode"] += 1
+            else:
+                src = src or self._source(path, st)
+                if src is None:
+                    continue
+                body = (src.digest, extra)
+                hits = by_digest.get(body) if self.dedupe else None
+                if hits is not None:
+                    stats["dup_content"] += 1
+                else:
+                    hits = tuple(file_hits(path, src))
+                    stats["files"] += 1
+                    if self.dedupe:
+                        by_digest[body] = hits
+                if ino:
+                    by_inode[ino] = hits
+            for h in hits:
+                yield h if h.path == path else h._replace(path=path)
+
+    def _scan(self, matcher):
+        return self._run(
+            self.iter_files(py_only=True),
+            lambda path, src: self._scan_file(path, src, matcher),
+        )
+
+    def _scan_file(self, path, src, matcher):
+        for nm, ln, node in self._calls(path, src):
+            entries = matcher.get(nm)
+            if entries is None:
+                continue
+            for intent, check in entries:
+                if check is None or check(node):
+                    yield Hit(path, ln, src.lines[ln-1].strip(), intent)
+                    break
+
+    def _search(self, needle):
+        return self._run(self.iter_files(), lambda path, src: self._search_file(path, src, needle))
+
+    def _search_file(self, path, src, needle):
+        for i, line in enumerate(src.lines, 1):
+            if needle in line.lower():
+                yield Hit(path, i, line.strip())
+
+# ─── QUERY LANGUAGE ──────────────────────────────────────────────────────────
+class QueryError(ValueError):
+    pass
+
+_QUERY_TOKEN = re.compile(
+    r"""\s*(?:(?P<paren>[()])|"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<word>[^\s()"']+))"""
+)
+_QUERY_OPS = {"AND", "OR", "NOT"}
+_QUERY_SCOPES = {"func", "function"}
+
+def _pattern_token(pattern):
+    """Last name component a call must spell out to match ``pattern``."""
+    return compile_pattern(pattern)[0].rsplit(".", 1)[-1]
+
+def _within(hits, span):
+    if span is None:
+        return hits
+    lo, hi = span
+    return tuple(h for h in hits if lo <= h.line <= hi)
+
+def _first_per_line(hits):
+    """Drop hits on a (path, line) already reported, keeping the first."""
+    seen = {}
+    for h in hits:
+        seen.setdefault((h.path, h.line), h)
+    return list(seen.values())
+
+def _tristate_all(values):
+    values = list(values)
+    if False in values:
+        return False
+    return True if all(v is True for v in values) else None
+
+def _tristate_any(values):
+    values = list(values)
+    if True in values:
+        return True
+    return False if all(v is False for v in values) else None
+
+class _QueryFile:
+    """Per-file evaluation state; predicate results are memoised across nodes."""
+    __slots__ = ("scanner", "path", "src", "memo")
+
+    def __init__(self, scanner, path, src):
+        self.scanner = scanner
+        self.path    = path
+        self.src     = src
+        self.memo    = {}
+
+# Every node answers three questions:
+#   on_path(path)  -> True/False, or None if the file content is needed
+#   eval(f, span)  -> does the node hold in file ``f`` (within ``span`` lines)
+#   collect(f, span) -> hits to report, only called when eval() is true
+# ``cost`` is a rough relative price used to order AND/OR children, and
+# ``reports`` says whether every match of the node yields at least one hit.
+
+class _PathPred:
+    cost    = 0
+    reports = False
+
+    def __init__(self, kind, value):
+        self.kind, self.value = kind, value
+        self._low = value.lstrip(".").lower() if kind == "ext" else value.lower()
+
+    def on_path(self, path):
+        fn = os.path.basename(path)
+        if self.kind == "file":
+            return fn == self.value
+        if self.kind == "ext":
+            return fn.lower().endswith(f".{self._low}")
+        return self._low in fn.lower()
+
+    def eval(self, f, span):
+        return self.on_path(f.path)
+
+    def collect(self, f, span):
+        return ()
+
+    def __str__(self):
+        return f"{self.kind}:{self.value}"
+
+class _TextPred:
+    cost    = 1
+    reports = True
+
+    def __init__(self, value):
+        self.value  = value
+        self.needle = value.lower()
+
+    def on_path(self, path):
+        return None
+
+    def hits(self, f, span):
+        key = ("text", self.needle)
+        hits = f.memo.get(key)
+        if hits is None:
+            hits = f.memo[key] = (
+                tuple(f.scanner._search_file(f.path, f.src, self.needle))
+                if self.needle in f.src.text.lower() else ()
+            )
+        return _within(hits, span)
+
+    def eval(self, f, span):
+        return bool(self.hits(f, span))
+
+    collect = hits
+
+    def __str__(self):
+        return f"text:{self.value!r}"
+
+class _IntentPred:
+    cost    = 2
+    reports = True
+
+    def __init__(self, intent):
+        self.intent = intent
+        self.tokens = {_pattern_token(p) for p in INTENT_PATTERNS[intent]}
+
+    def on_path(self, path):
+        return None if path.lower().endswith(".py") else False
+
+    def hits(self, f, span):
+        key = ("intent", self.intent)
+        hits = f.memo.get(key)
+        if hits is None:
+            text = f.src.text
+            # byte prefilter: no pattern's final name appears -> skip the parse
+            if self.on_path(f.path) is False:
+                hits = ()
+            elif any(t in text for t in self.tokens):
+                matcher = f.scanner._matcher((self.intent,))
+                hits = tuple(f.scanner._scan_file(f.path, f.src, matcher))
+            else:
+                hits = ()
+            f.memo[key] = hits
+        return _within(hits, span)
+
+    def eval(self, f, span):
+        return bool(self.hits(f, span))
+
+    collect = hits
+
+    def __str__(self):
+        return f"intent:{self.intent!r}"
+
+class _Not:
+    def __init__(self, child):
+        self.child   = child
+        self.cost    = child.cost
+        self.reports = False
+
+    def on_path(self, path):
+        v = self.child.on_path(path)
+        return None if v is None else not v
+
+    def eval(self, f, span):
+        return not self.child.eval(f, span)
+
+    def collect(self, f, span):
+        return ()
+
+    def __str__(self):
+        return f"NOT {self.child}"
+
+class _And:
+    def __init__(self, children):
+        self.children = sorted(children, key=lambda c: c.cost)
+        self.cost     = sum(c.cost for c in children)
+        self.reports  = any(c.reports for c in children)
+
+    def on_path(self, path):
+        return _tristate_all(c.on_path(path) for c in self.children)
+
+    def eval(self, f, span):
+        return all(c.eval(f, span) for c in self.children)
+
+    def collect(self, f, span):
+        return [h for c in self.children for h in c.collect(f, span)]
+
+    def __str__(self):
+        return "(" + " AND ".join(map(str, self.children)) + ")"
+
+class _Or(_And):
+    def __init__(self, children):
+        super().__init__(children)
+        self.reports = all(c.reports for c in children)
+
+    def on_path(self, path):
+        return _tristate_any(c.on_path(path) for c in self.children)
+
+    def eval(self, f, span):
+        return any(c.eval(f, span) for c in self.children)
+
+    def collect(self, f, span):
+        return [h for c in self.children if c.eval(f, span) for h in c.collect(f, span)]
+
+    def __str__(self):
+        return "(" + " OR ".join(map(str, self.children)) + ")"
+
+class _FuncScope:
+    def __init__(self, child):
+        self.child   = child
+        self.cost    = child.cost + 3
+        self.reports = child.reports
+
+    def on_path(self, path):
+        if not path.lower().endswith(".py") or self.child.on_path(path) is False:
+            return False
+        return None
+
+    def _spans(self, f, span):
+        if self.on_path(f.path) is False:
+            return
+        for lo, hi in f.scanner._funcs(f.path, f.src):
+            if span is None or (span[0] <= lo and hi <= span[1]):
+                if self.child.eval(f, (lo, hi)):
+                    yield lo, hi
+
+    def eval(self, f, span):
+        return any(True for _ in self._spans(f, span))
+
+    def collect(self, f, span):
+        return _first_per_line(
+            h for sp in self._spans(f, span) for h in self.child.collect(f, sp))
+
+    def __str__(self):
+        return f"func({self.child})"
+
+class _QueryParser:
+    def __init__(self, expr, resolve):
+        self.expr    = expr
+        self.resolve = resolve
+        self.toks    = self._tokenize(expr)
+        self.i       = 0
+        self.paths   = []
+
+    @staticmethod
+    def _tokenize(expr):
+        toks, pos, expr = [], 0, expr.rstrip()
+        while pos < len(expr):
+            m = _QUERY_TOKEN.match(expr, pos)
+            if not m:
+                raise QueryError(f"unexpected input at column {pos + 1}: {expr[pos:pos + 12]!r}")
+            pos = m.end()
+            if m.group("paren"):
+                toks.append((m.group("paren"), None))
+            elif m.group("word") is not None:
+                toks.append(("word", m.group("word")))
+            else:
+                toks.append(("str", m.group("dq") if m.group("dq") is not None else m.group("sq")))
+        return toks
+
+    def _peek(self, offset=0):
+        j = self.i + offset
+        return self.toks[j] if j < len(self.toks) else (None, None)
+
+    def _is_op(self, tok, op=None):
+        kind, val = tok
+        return kind == "word" and val.upper() in ({op} if op else _QUERY_OPS)
+
+    def parse(self):
+        if not self.toks:
+            raise QueryError("empty query")
+        node = self._or()
+        if self.i < len(self.toks):
+            raise QueryError(f"unexpected {self.toks[self.i][1] or self.toks[self.i][0]!r}")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._is_op(self._peek(), "OR"):
+            self.i += 1
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else _Or(nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._is_op(self._peek(), "AND"):
+            self.i += 1
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else _And(nodes)
+
+    def _not(self):
+        if self._is_op(self._peek(), "NOT"):
+            self.i += 1
+            return _Not(self._not())
+        return self._atom()
+
+    def _atom(self):
+        kind, val = self._peek()
+        if kind is None:
+            raise QueryError("unexpected end of query")
+        if kind == "(":
+            self.i += 1
+            node = self._or()
+            self._expect(")")
+            return node
+        if kind == ")" or self._is_op((kind, val)):
+            raise QueryError(f"unexpected {val or kind!r}")
+        if kind == "word" and val.lower() in _QUERY_SCOPES and self._peek(1)[0] == "(":
+            self.i += 2
+            node = self._or()
+            self._expect(")")
+            return _FuncScope(node)
+        if kind == "word" and ":" in val:
+            key, _, arg = val.partition(":")
+            key = key.lower()
+            if key in ("intent", "text", "name", "ext", "file"):
+                self.i += 1
+                if not arg:
+                    nkind, arg = self._peek()
+                    if nkind not in ("word", "str"):
+                        raise QueryError(f"missing value after {key}:")
+                    self.i += 1
+                return self._leaf(key, arg)
+        if kind == "str":
+            self.i += 1
+            return self._leaf("intent", val)
+        # consecutive bare words form one intent name: http request AND ...
+        words = []
+        while True:
+            kind, val = self._peek()
+            if kind != "word" or self._is_op((kind, val)) or ":" in val:
+                break
+            if val.lower() in _QUERY_SCOPES and self._peek(1)[0] == "(":
+                break
+            words.append(val)
+            self.i += 1
+        return self._leaf("intent", " ".join(words))
+
+    def _expect(self, kind):
+        if self._peek()[0] != kind:
+            raise QueryError(f"expected {kind!r}")
+        self.i += 1
+
+    def _leaf(self, key, arg):
+        if key == "intent":
+            return _IntentPred(self.resolve(arg))
+        if key == "text":
+            if not arg:
+                raise QueryError("empty text: predicate")
+            return _TextPred(arg)
+        node = _PathPred(key, arg)
+        self.paths.append(node)
+        return node
+
+class Query:
+    """A compiled boolean query over intents, text and filenames.
+
+    Predicates: ``"http request"`` / bare words / ``intent:X`` (AST intent),
+    ``text:X`` (case-insensitive substring), ``name:X`` (filename contains),
+    ``ext:X`` and ``file:X`` (exact basename). Combine them with ``AND``,
+    ``OR``, ``NOT`` and parentheses; ``func(...)`` requires its expression to
+    hold inside a single function rather than anywhere in the file.
+
+        "http request" AND "shell exec" AND NOT validation
+        func(text:password AND logging) AND NOT name:test
+
+    The planner orders each AND/OR by cost (filename < text < intent <
+    function scope) and short-circuits, decides what it can from the path
+    alone before reading a file, and skips parsing when no pattern's name
+    occurs in the source. Matching files report the hits of their positive
+    predicates, so a query must have one on every branch: ``NOT validation``
+    or ``ext:py OR http`` raise ``QueryError``.
+    """
+
+    def __init__(self, expr, resolve=None):
+        parser = _QueryParser(expr, resolve or Scanner.resolve)
+        self.expr  = expr
+        self.root  = parser.parse()
+        self._path = parser.paths
+        if not self.root.reports:
+            raise QueryError("query needs an intent or text: predicate outside NOT "
+                             "on every OR branch to report lines")
+
+    def __str__(self):
+        return str(self.root)
+
+    def keep(self, path):
+        return self.root.on_path(path) is not False
+
+    def key(self, path):
+        # intents only apply to .py files, so that is part of the key too
+        return (path.lower().endswith(".py"),) + tuple(p.on_path(path) for p in self._path)
+
+    def file_hits(self, scanner, path, src):
+        f = _QueryFile(scanner, path, src)
+        if not self.root.eval(f, None):
+            return []
+        return sorted(_first_per_line(self.root.collect(f, None)), key=lambda h: h.line)
+
+# ─── CALL GRAPH INDEX ────────────────────────────────────────────────────────
+def _module_name(path, is_pkg_dir):
+    """Dotted import name of ``path``, following ``__init__.py`` upwards."""
+    d, fn = os.path.split(os.path.abspath(path))
+    parts = [] if fn == "__init__.py" else [fn[:-3]]
+    while is_pkg_dir(d):
+        d, pkg = os.path.split(d)
+        parts.insert(0, pkg)
+    return ".".join(parts)
+
+class _GraphVisitor(ast.NodeVisitor):
+    """Collects the import-resolved call edges of a module, keyed by calling function."""
+
+    def __init__(self, module, is_pkg):
+        self.module   = module
+        self.package  = module if is_pkg else module.rpartition(".")[0]
+        self.imports  = {}
+        self.toplevel = set()
+        self.calls    = []   # (caller, line, raw name, resolved name)
+        self.scope    = [module]
+        self.caller   = [f"{module}.<module>"]
+        self.classes  = [None]
+
+    def build(self, tree):
+        for n in tree.body:
+            if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.toplevel.add(n.name)
+        for n in ast.walk(tree):
+            if isinstance(n, ast.Import):
+                for a in n.names:
+                    if a.asname:
+                        self.imports[a.asname] = a.name
+                    else:
+                        head = a.name.split(".")[0]
+                        self.imports[head] = head
+            elif isinstance(n, ast.ImportFrom):
+                base = n.module or ""
+                if n.level:
+                    pkg = self.package.split(".") if self.package else []
+                    if n.level > 1:
+                        pkg = pkg[:-(n.level - 1)]
+                    base = ".".join(pkg + ([n.module] if n.module else []))
+                for a in n.names:
+                    if a.name != "*":
+                        self.imports[a.asname or a.name] = f"{base}.{a.name}" if base else a.name
+        self.visit(tree)
+        return self
+
+    def resolve(self, raw):
+        head, _, rest = raw.partition(".")
+        cls = self.classes[-1]
+        if head in ("self", "cls") and cls and rest:
+            return f"{cls}.{rest}"
+        if head in self.imports:
+            base = self.imports[head]
+            return f"{base}.{rest}" if rest else base
+        if head in self.toplevel:
+            return f"{self.module}.{raw}"
+        return raw
+
+    def visit_ClassDef(self, node):
+        qual = ".".join(self.scope + [node.name])
+        self.scope.append(node.name)
+        self.classes.append(qual)
+        self.generic_visit(node)
+        self.classes.pop()
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node):
+        qual = ".".join(self.scope + [node.name])
+        self.scope.append(node.name)
+        self.caller.append(qual)
+        self.generic_visit(node)
+        self.caller.pop()
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node):
+        raw = get_full_name(node.func)
+        if raw:
+            self.calls.append((self.caller[-1], node.lineno, raw, self.resolve(raw)))
+        self.generic_visit(node)
+
+class CallGraphIndex:
+    """Persistent project-wide call graph backing ``--transitive`` searches.
+
+    Stored in SQLite so that large trees (~100k modules) are queried without
+    being rebuilt: :meth:`update` re-parses only files whose mtime or size
+    changed and drops files that disappeared. Calls are resolved through
+    ``import`` / ``from ... import`` aliases, module-level definitions and
+    ``self.``/``cls.`` method calls; dynamic dispatch is not followed.
+    """
+    SCHEMA_VERSION = 2
+    _CHUNK = 500
+
+    def __init__(self, path):
+        self.path = path
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.db.executescript("""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS funcs;  -- schema 1, never queried
+                DROP TABLE IF EXISTS calls;
+                CREATE TABLE files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+                CREATE TABLE calls (caller TEXT, path TEXT, line INTEGER, raw TEXT, callee TEXT);
+                CREATE INDEX calls_path  ON calls(path);
+                CREATE INDEX calls_raw   ON calls(raw);
+                CREATE INDEX calls_callee ON calls(callee);
+            """)
+            self.db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self.db.commit()
+
+    @staticmethod
+    def default_path(roots):
+        """Per-project index file under the user cache directory."""
+        key = "\0".join(sorted(os.path.abspath(r) for r in roots))
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "mindgrep", f"callgraph-{digest}.sqlite")
+
+    def close(self):
+        self.db.close()
+
+    def update(self, scanner):
+        """Bring the index in line with every ``.py`` file under the scanner's roots.
+
+        Returns ``(reindexed, removed)`` file counts.
+        """
+        known = {p: (m, s) for p, m, s in self.db.execute("SELECT path, mtime_ns, size FROM files")}
+        pkg_dirs = {}
+
+        def is_pkg_dir(d):
+            if d not in pkg_dirs:
+                pkg_dirs[d] = os.path.isfile(os.path.join(d, "__init__.py"))
+            return pkg_dirs[d]
+
+        seen, changed = set(), 0
+        with self.db:
+            for full in scanner._walk():
+                if not full.endswith(".py"):
+                    continue
+                path = os.path.abspath(full)
+                if path in seen:
+                    continue
+                seen.add(path)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if known.get(path) == (st.st_mtime_ns, st.st_size):
+                    continue
+                src = scanner._source(path, st)
+                if src is None:
+                    continue
+                self._forget(path)
+                self._index(path, src, _module_name(path, is_pkg_dir))
+                self.db.execute("INSERT INTO files VALUES (?, ?, ?)", (path, *src.stamp))
+                changed += 1
+            removed = [p for p in known if p not in seen]
+            for p in removed:
+                self._forget(p)
+        return changed, len(removed)
+
+    def _forget(self, path):
+        self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.db.execute("DELETE FROM calls WHERE path = ?", (path,))
+
+    def _index(self, path, src, module):
+        try:
+            tree = ast.parse(src.text, filename=path)
+        except Exception:
+            return
+        v = _GraphVisitor(module, path.endswith("__init__.py")).build(tree)
+        self.db.executemany("INSERT INTO calls VALUES (?, ?, ?, ?, ?)",
+                            [(c, path, ln, raw, res) for c, ln, raw, res in v.calls])
+
+    def _calls_to(self, column, names):
+        names = list(names)
+        for i in range(0, len(names), self._CHUNK):
+            chunk = names[i:i + self._CHUNK]
+            marks = ",".join("?" * len(chunk))
+            yield from self.db.execute(
+                f"SELECT caller, path, line, raw, callee FROM calls "
+                f"WHERE {column} IN ({marks}) ORDER BY path, line", chunk)
+
+    def reaching(self, names, hops):
+        """Map each function reaching a call in ``names`` (``{name: intent}``)
+        within ``hops`` extra calls to ``(path, call line, chain, intent)``."""
+        reached = {}
+        for column in ("raw", "callee"):
+            for caller, path, line, raw, callee in self._calls_to(column, names):
+                name = raw if column == "raw" else callee
+                if caller not in reached:
+                    reached[caller] = (path, line, (caller, name), names[name])
+        frontier = set(reached)
+        for _ in range(hops):
+            # calling a class runs its __init__
+            targets = frontier | {q[:-len(".__init__")] for q in frontier if q.endswith(".__init__")}
+            nxt = set()
+            for caller, path, line, raw, callee in self._calls_to("callee", targets):
+                if caller in reached:
+                    continue
+                target = callee if callee in reached else f"{callee}.__init__"
+                _, _, chain, intent = reached[target]
+                reached[caller] = (path, line, (caller,) + chain, intent)
+                nxt.add(caller)
+            if not nxt:
+                break
+            frontier = nxt
+        return reached
+
+# ─── EXPORTERS ───────────────────────────────────────────────────────────────
+# Record layout shared by the jsonl, csv and compact formats. Fields are only
+# ever appended; bump HIT_SCHEMA_VERSION if one is renamed or removed.
+HIT_SCHEMA_VERSION = 1
+HIT_FIELDS = ("path", "line", "code", "intent", "commit", "author", "chain")
+HIT_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": f"https://github.com/hiddenfoxy/mindgrep/schema/hit-v{HIT_SCHEMA_VERSION}.json",
+    "title": "mindgrep hit",
+    "type": "object",
+    "required": ["path", "line", "code", "intent"],
+    "properties": {
+        "path":   {"type": "string"},
+        "line":   {"type": "integer", "minimum": 1},
+        "code":   {"type": "string"},
+        "intent": {"type": ["string", "null"]},
+        "commit": {"type": "string"},
+        "author": {"type": "string"},
+        "chain":  {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+_JSON = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+def hit_record(hit, commit=None):
+    """The schema-stable dict for one hit; blame fields only when known."""
+    rec = {"path": hit.path, "line": hit.line, "code": hit.code, "intent": hit.intent}
+    if commit is not None:
+        rec["commit"] = commit.hexsha
+        rec["author"] = commit.author.name
+    if hit.chain:
+        rec["chain"] = list(hit.chain)
+    return rec
+
+class _Exporter:
+    binary = False
+
+    def __init__(self, fh, root="."):
+        self.fh   = fh
+        self.root = root
+
+    def begin(self):
+        pass
+
+    def write(self, hit, commit=None):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+class JsonExporter(_Exporter):
+    """Same document as ``-J`` (indented list), written one element at a time."""
+
+    def begin(self):
+        self.n = 0
+
+    def write(self, hit, commit=None):
+        rec = hit.to_dict()
+        if commit is not None:
+            rec["blame"] = {"commit": commit.hexsha, "author": commit.author.name}
+        body = json.dumps(rec, indent=2).replace("\n", "\n  ")
+        self.fh.write(("[\n  " if not self.n else ",\n  ") + body)
+        self.n += 1
+
+    def end(self):
+        self.fh.write("\n]\n" if self.n else "[]\n")
+
+class JsonlExporter(_Exporter):
+    def write(self, hit, commit=None):
+        self.fh.write(_JSON.encode(hit_record(hit, commit)) + "\n")
+
+class CsvExporter(_Exporter):
+    def begin(self):
+        self.w = csv.writer(self.fh)
+        self.w.writerow(HIT_FIELDS)
+
+    def write(self, hit, commit=None):
+        self.w.writerow((
+            hit.path, hit.line, hit.code, hit.intent or "",
+            commit.hexsha if commit is not None else "",
+            commit.author.name if commit is not None else "",
+            " -> ".join(hit.chain),
+        ))
+
+class SarifExporter(_Exporter):
+    """SARIF 2.1.0. Results are streamed first; ``tool`` (whose rule list is
+    only known at the end) is written after them, which JSON allows."""
+
+    def begin(self):
+        self.rules = {}
+        self.n = 0
+        self.fh.write(
+            '{"$schema":"https://json.schemastore.org/sarif-2.1.0.json",'
+            '"version":"2.1.0","runs":[{"results":['
+        )
+
+    def write(self, hit, commit=None):
+        rule = (hit.intent or "text match").replace(" ", "-")
+        self.rules.setdefault(rule, hit.intent or "text match")
+        uri = urllib.parse.quote(os.path.relpath(hit.path, self.root).replace(os.sep, "/"))
+        res = {
+            "ruleId": rule,
+            "level": "note",
+            "message": {"text": (
+                f"{hit.intent or 'match'}: {hit.code}" if not hit.chain
+                else f"reaches {hit.intent} via {' -> '.join(hit.chain)}"
+            )},
+            "locations": [{"physicalLocation": {
+                "artifactLocation": {"uri": uri, "uriBaseId": "SRCROOT"},
+                "region": {"startLine": hit.line, "snippet": {"text": hit.code}},
+            }}],
+        }
+        if commit is not None:
+            res["properties"] = {"commit": commit.hexsha, "author": commit.author.name}
+        self.fh.write(("," if self.n else "") + _JSON.encode(res))
+        self.n += 1
+
+    def end(self):
+        tool = {"driver": {
+            "name": "mindgrep",
+            "informationUri": "https://github.com/hiddenfoxy/mindgrep",
+            "rules": [
+                {"id": rid, "name": rid, "shortDescription": {"text": name}}
+                for rid, name in self.rules.items()
+            ],
+        }}
+        base = {"SRCROOT": {"uri": pathlib.Path(self.root).resolve().as_uri() + "/"}}
+        self.fh.write(
+            '],"tool":' + _JSON.encode(tool)
+            + ',"originalUriBaseIds":' + _JSON.encode(base) + "}]}\n"
+        )
+
+def _mp_pack(obj, out):
+    """Append the MessagePack encoding of a str/int/bool/None/list/dict."""
+    if obj is None:
+        out += b"\xc0"
+    elif obj is True or obj is False:
+        out += b"\xc3" if obj else b"\xc2"
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xff)
+        elif 0 <= obj <= 0xffffffff:
+            out += struct.pack(">BI", 0xce, obj)
+        else:
+            out += struct.pack(">Bq", 0xd3, obj)
+    elif isinstance(obj, str):
+        b = obj.encode("utf-8")
+        n = len(b)
+        if n < 32:
+            out.append(0xa0 | n)
+        elif n < 0x100:
+            out += struct.pack(">BB", 0xd9, n)
+        elif n < 0x10000:
+            out += struct.pack(">BH", 0xda, n)
+        else:
+            out += struct.pack(">BI", 0xdb, n)
+        out += b
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        out += bytes([0x90 | n]) if n < 16 else struct.pack(">BI", 0xdd, n)
+        for v in obj:
+            _mp_pack(v, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        out += bytes([0x80 | n]) if n < 16 else struct.pack(">BI", 0xdf, n)
+        for k, v in obj.items():
+            _mp_pack(k, out)
+            _mp_pack(v, out)
+    else:
+        raise TypeError(f"cannot pack {type(obj).__name__}")
+    return out
+
+class CompactExporter(_Exporter):
+    """A MessagePack stream: one header map, then one array per hit in
+    ``HIT_FIELDS`` order. Readable with any msgpack unpacker or
+    :func:`read_compact`."""
+    binary = True
+
+    def begin(self):
+        self.fh.write(_mp_pack({
+            "format": "mindgrep-hits",
+            "version": HIT_SCHEMA_VERSION,
+            "fields": list(HIT_FIELDS),
+        }, bytearray()))
+
+    def write(self, hit, commit=None):
+        self.fh.write(_mp_pack((
+            hit.path, hit.line, hit.code, hit.intent,
+            commit.hexsha if commit is not None else None,
+            commit.author.name if commit is not None else None,
+            list(hit.chain) or None,
+        ), bytearray()))
+
+def _mp_unpack(buf, i):
+    b = buf[i]
+    i += 1
+    if b < 0x80:
+        return b, i
+    if b >= 0xe0:
+        return b - 0x100, i
+    if b == 0xc0:
+        return None, i
+    if b in (0xc2, 0xc3):
+        return b == 0xc3, i
+    if 0xa0 <= b < 0xc0 or b in (0xd9, 0xda, 0xdb):
+        if b < 0xc0:
+            n = b & 0x1f
+        else:
+            size = {0xd9: 1, 0xda: 2, 0xdb: 4}[b]
+            n = int.from_bytes(buf[i:i + size], "big")
+            i += size
+        return buf[i:i + n].decode("utf-8"), i + n
+    if b == 0xce:
+        return struct.unpack_from(">I", buf, i)[0], i + 4
+    if b == 0xd3:
+        return struct.unpack_from(">q", buf, i)[0], i + 8
+    if 0x90 <= b < 0xa0 or b == 0xdd:
+        if b == 0xdd:
+            n, i = struct.unpack_from(">I", buf, i)[0], i + 4
+        else:
+            n = b & 0x0f
+        out = []
+        for _ in range(n):
+            v, i = _mp_unpack(buf, i)
+            out.append(v)
+        return out, i
+    if 0x80 <= b < 0x90 or b == 0xdf:
+        if b == 0xdf:
+            n, i = struct.unpack_from(">I", buf, i)[0], i + 4
+        else:
+            n = b & 0x0f
+        out = {}
+        for _ in range(n):
+            k, i = _mp_unpack(buf, i)
+            out[k], i = _mp_unpack(buf, i)
+        return out, i
+    raise ValueError(f"unsupported msgpack type byte 0x{b:02x}")
+
+def read_compact(data):
+    """Yield hit records (dicts) from a compact export's bytes."""
+    header, i = _mp_unpack(data, 0)
+    if not isinstance(header, dict) or header.get("format") != "mindgrep-hits":
+        raise ValueError("not a mindgrep compact export")
+    fields = header["fields"]
+    while i < len(data):
+        row, i = _mp_unpack(data, i)
+        rec = dict(zip(fields, row))
+        if rec.get("commit") is None:
+            rec.pop("commit", None)
+            rec.pop("author", None)
+        if not rec.get("chain"):
+            rec.pop("chain", None)
+        yield rec
+
+EXPORTERS = {
+    "json":    JsonExporter,
+    "jsonl":   JsonlExporter,
+    "csv":     CsvExporter,
+    "sarif":   SarifExporter,
+    "compact": CompactExporter,
+}
+
+@contextlib.contextmanager
+def open_output(path=None, binary=False, bufsize=1 << 20):
+    """Buffered handle for ``path``, or stdout when ``path`` is None/``-``."""
+    if not path or path == "-":
+        fh = sys.stdout
+        if isinstance(fh, StreamWrapper) and fh is colorama_init.wrapped_stdout:
+            # exports carry no ANSI codes; skip colorama's per-write conversion
+            fh.flush()
+            fh = colorama_init.orig_stdout
+        if binary:
+            if not hasattr(fh, "buffer"):
+                raise ValueError("stdout is not a binary stream; write to a file with -o")
+            fh.flush()
+            fh = fh.buffer
+        yield fh
+        fh.flush()
+    elif binary:
+        with open(path, "wb", buffering=bufsize) as fh:
+            yield fh
+    else:
+        with open(path, "w", encoding="utf-8", newline="", buffering=bufsize) as fh:
+            yield fh
+
+def export_hits(hits, fmt, fh, root=".", blame=None):
+    """Stream ``hits`` to ``fh`` in ``fmt``; ``blame(hit)`` may supply a commit.
+
+    Returns the number of hits written.
+    """
+    ex = EXPORTERS[fmt](fh, root)
+    ex.begin()
+    n = 0
+    for h in hits:
+        ex.write(h, blame(h) if blame else None)
+        n += 1
+    ex.end()
+    return n
+
+def _parse_size(value):
+    """argparse type for sizes like ``65536``, ``512K``, ``64M``, ``1G``."""
+    m = re.fullmatch(r"\s*(\d+)\s*([kmg]?)i?b?\s*", value, re.I)
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}")
+    return int(m.group(1)) << {"": 0, "k": 10, "m": 20, "g": 30}[m.group(2).lower()]
+
+def collect(hits):
+    """Materialise an iterable of hits into the ``(matches, results)`` pair."""
+    matches, results = {}, []
+    for h in hits:
+        matches.setdefault(h.path, []).append((h.line, h.code))
+        results.append(h.to_dict())
+    return matches, results
+
+def find_intent_matches(intent, root, file_ext=None, name_filter=None, file_name_exact=None):
+    scanner = Scanner(root, file_ext=file_ext, name_filter=name_filter,
+                      file_name_exact=file_name_exact)
+    return collect(scanner.scan([intent]))
+
+def search_value(val, root, file_ext=None, name_filter=None, file_name_exact=None):
+    scanner = Scanner(root, file_ext=file_ext, name_filter=name_filter,
+                      file_name_exact=file_name_exact)
+    return collect(scanner.search(val))
+
+def with_context(path, lineno, ctx=3):
+    return Scanner(cache=False).context(path, lineno, ctx)
+
+def get_staged_files(rp):
+    scanner = Scanner(rp, cache=False)
+    repo = scanner.repo()
+    if repo is None:
+        print(f"{Fore.YELLOW}⚠️  Not a git repo, ignoring --staged{RESET}")
+        return None
+    top = repo.working_tree_dir
+    return sorted(os.path.relpath(p, top) for p in scanner.staged_files())
+
+def get_blame(path, lineno):
+    scanner = Scanner(path, cache=False)
+    commit = scanner.blame(path, lineno)
+    if commit is None:
+        return None, None
+    return commit, [c for _, c in scanner.context(path, lineno, 0)]
+
+def resolve_intent(q, intents):
+    m, score, _ = process.extractOne(q, intents)
+    return m if score >= 60 else None
+
+
+def stats(matches, run=None):
+    data = {
+        "timestamp": str(datetime.datetime.now()),
+        "files":     len(matches),
+        "hits":      sum(len(v) for v in matches.values()),
+    }
+    if run is not None:
+        data["duplicates"] = {"inode": run["dup_inode"], "content": run["dup_content"]}
+        if "io_wait" in run:
+            data["io_wait"] = round(run["io_wait"], 6)
+    return data
+
+def _dup_summary(data):
+    d = data.get("duplicates")
+    if not d or not (d["inode"] or d["content"]):
+        return None
+    return f"{d['inode'] + d['content']} skipped ({d['inode']} linked, {d['content']} identical)"
+
+def export_report(data, fmt="markdown"):
+    if fmt == "json":
+        return json.dumps(data, indent=2)
+    dups = _dup_summary(data)
+    if fmt == "html":
+        return (
+            "<html><body>"
+            f"<h1>mindgrep Report</h1>"
+            f"<ul><li>Time: {data['timestamp']}</li>"
+            f"<li>Files: {data['files']}</li>"
+            f"<li>Hits: {data['hits']}</li>"
+            + (f"<li>Duplicates: {dups}</li>" if dups else "")
+            + (f"<li>I/O wait: {data['io_wait']:.3f}s</li>" if "io_wait" in data else "")
+            + "</ul></body></html>"
+        )
+    return (
+        f"**mindgrep Report**\n"
+        f"- Time: {data['timestamp']}\n"
+        f"- Files: {data['files']}\n"
+        f"- Hits:  {data['hits']}\n"
+        + (f"- Dupes: {dups}\n" if dups else "")
+        + (f"- I/O wait: {data['io_wait']:.3f}s\n" if "io_wait" in data else "")
+    )
+
+def print_report(data, fmt="markdown"):
+    if fmt == "json":
+        print(export_report(data, "json"))
+    elif fmt == "html":
+        print(export_report(data, "html"))
+    else:
+        print(f"{STAT_HDR}mindgrep Report{RESET}")
+        print(f"{STAT_HDR}- Time:{RESET}  {STAT_VAL}{data['timestamp']}{RESET}")
+        print(f"{STAT_HDR}- Files:{RESET} {STAT_VAL}{data['files']}{RESET}")
+        print(f"{STAT_HDR}- Hits:{RESET}  {STAT_VAL}{data['hits']}{RESET}")
+        dups = _dup_summary(data)
+        if dups:
+            print(f"{STAT_HDR}- Dupes:{RESET} {STAT_VAL}{dups}{RESET}")
+        if "io_wait" in data:
+            print(f"{STAT_HDR}- I/O wait:{RESET} {STAT_VAL}{data['io_wait']:.3f}s{RESET}")
+
+
+def interactive_view(matches):
+    console = Console()
+    table   = Table(title="mindgrep Interactive")
+    table.add_column("Idx", justify="right")
+    table.add_column("File")
+    table.add_column("Line")
+    table.add_column("Code")
+
+    rows, idx = [], 1
+    for path, hits in matches.items():
+        for ln, code in hits:
+            table.add_row(str(idx), path, str(ln), code)
+            rows.append((path, ln))
+            idx += 1
+
+    console.print(table)
+    choice = console.input("Select index to open (ENTER to skip): ")
+    if not choice.isdigit():
+        return
+
+    sel = int(choice) - 1
+    if not (0 <= sel < len(rows)):
+        color_error("⚠️  Invalid selection")
+        return
+
+    fp, ln = rows[sel]
+    if os.name == "nt":
+        ed, args = os.environ.get("EDITOR", "notepad"), [fp]
+    else:
+        ed, args = os.environ.get("EDITOR", "vim"), [f"+{ln}", fp]
+
+    console.print(f"Opening {fp}:{ln} in {ed}")
+    try:
+        subprocess.run([ed] + args)
+    except FileNotFoundError:
+        color_error(f"⚠️  Editor '{ed}' not found.")
+
+def color_error(msg):
+    print(f"{Fore.RED}{Style.BRIGHT}{msg}{RESET}")
+
+def build_tree(matches, root):
+    tree = {}
+    for full_path, hits in matches.items():
+        lines = [ln for ln, _ in hits]
+        rel = os.path.relpath(full_path, root)
+        parts = rel.split(os.sep)
+
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node.setdefault(parts[-1], []).extend(lines)
+    return tree
+
+def _tree_lines(tree, prefix=""):
+    items = list(tree.items())
+    for i, (name, val) in enumerate(items):
+        last = (i == len(items) - 1)
+        conn = f"{CONN_COLOR}{'└──' if last else '├──'}{RESET}"
+        if isinstance(val, dict):
+            yield f"{prefix}{conn} {DIR_COLOR}{name}{os.sep}{RESET}\n"
+            yield from _tree_lines(val, prefix + ("    " if last else "│   "))
+        else:
+            nums = ",".join(str(n) for n in sorted(val))
+            yield f"{prefix}{conn} {FILE_COLOR}{name}{RESET}:{LINE_COLOR}{nums}{RESET}\n"
+
+def print_tree(tree, prefix=""):
+    sys.stdout.write("".join(_tree_lines(tree, prefix)))
+
+def output_table(matches):
+    rows = []
+    for p, hits in matches.items():
+        for ln, c in hits:
+            rows.append([p, ln, c])
+    if not rows:
+        print("(no matches)")
+        return
+    hdr = [STAT_HDR + h + RESET for h in ["Path", "Line", "Code"]]
+    clr = [[r[0], f"{STAT_VAL}{r[1]}{RESET}", f"{CODE_COLOR}{r[2]}{RESET}"] for r in rows]
+    print(tabulate(clr, headers=hdr, tablefmt="fancy_grid"))
+
+def main():
+    desc = """\
+MindGrep: Semantic-aware code search for any codebase.
+Intent-based AST search + text search + Git/blame + interactive TUI + stats & reports.
+
+Contoh:
+  --FN "main.py"    → exact match file “main.py”
+  -X "a.py,b.txt"   → kecualikan file a.py dan b.txt
+"""
+    parser = argparse.ArgumentParser(
+        prog="mindgrep",
+        description=desc,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("-V", "--value", metavar="VAL", help="plain-text search string")
+    parser.add_argument("-Q", "--query", metavar="EXPR", help='boolean query, e.g. -Q \'"http request" AND NOT validation\'')
+    parser.add_argument("-F", "--file", dest="file_ext", help="filter by file extension")
+    parser.add_argument("-N", "--name", dest="name_filter", help="filter by filename substring")
+    parser.add_argument("--FN", dest="file_name_exact", help='filter by exact filename, e.g. --FN "main.py"')
+    parser.add_argument("-X", "--exclude", dest="exclude", help='exclude comma-separated basenames, e.g. -X "a.py,b.txt"')
+    parser.add_argument("-P", "--path", dest="path", default=".", help="root folder to scan")
+    parser.add_argument("-T", "--table", action="store_true", help="styled table output")
+    parser.add_argument("-J", "--json", action="store_true", help="JSON output")
+    parser.add_argument("--format", choices=sorted(EXPORTERS), help="streaming output format (compact = MessagePack)")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write --format output to FILE instead of stdout")
+    parser.add_argument("--schema", action="store_true", help="print the JSON schema of jsonl/csv/compact records")
+    parser.add_argument("-C", "--context", type=int, default=0, help="show N context lines")
+    parser.add_argument("--follow-links", action="store_true", help="descend into symlinked directories")
+    parser.add_argument("--no-dedupe", action="store_true", help="scan hard-linked and identical files separately")
+    parser.add_argument("--transitive", type=int, nargs="?", const=3, metavar="HOPS",
+                        help="also report functions reaching the intent through up to HOPS calls (default 3)")
+    parser.add_argument("--index", metavar="FILE", help="call-graph index file for --transitive")
+    parser.add_argument("--io-threads", type=int, default=0, metavar="N",
+                        help="read files ahead on N threads while matching (0 = off)")
+    parser.add_argument("--prefetch-bytes", type=_parse_size, default=64 << 20, metavar="SIZE",
+                        help="memory budget for read-ahead, e.g. 256M (default 64M)")
+    parser.add_argument("--staged", action="store_true", help="scan only git-staged files")
+    parser.add_argument("--blame", action="store_true", help="show git blame")
+    parser.add_argument("--stats", action="store_true", help="show summary stats")
+    parser.add_argument("--report", choices=["markdown","html","json"], help="export stats report")
+    parser.add_argument("--interactive", action="store_true", help="interactive TUI mode")
+    parser.add_argument("--intent-list", action="store_true", help="list all supported intents")
+    parser.add_argument("--theme", choices=["light","dark"], default="light", help="color theme")
+    parser.add_argument("intent", nargs="?", help="intent name (ignored if -V used)")
+    args = parser.parse_args()
+
+    # prepare exclude list
+    exclude_list = []
+    if args.exclude:
+        exclude_list = [e.strip() for e in args.exclude.split(",") if e.strip()]
+
+    args.path = os.path.expanduser(args.path)
+    apply_theme(args.theme)
+    plugins = load_plugins()
+    scanner = Scanner(
+        args.path,
+        file_ext=args.file_ext, name_filter=args.name_filter,
+        file_name_exact=args.file_name_exact, exclude=exclude_list,
+        dedupe=not args.no_dedupe, follow_links=args.follow_links,
+        io_threads=args.io_threads, prefetch_bytes=args.prefetch_bytes,
+        cache=False,
+    )
+
+    if args.schema:
+        print(json.dumps(HIT_SCHEMA, indent=2))
+        sys.exit(0)
+
+    # mode list-files only
+    if not args.intent and not args.value and not args.query and (
+       args.file_ext or args.name_filter or args.file_name_exact
+    ):
+        found = list(scanner.iter_files())
+        if not found:
+            color_error("⚠️  No files matched your criteria!")
+            sys.exit(0)
+        tree = {}
+        for f in sorted(found):
+            rel = os.path.relpath(f, args.path)
+            parts = rel.split(os.sep)
+            node = tree
+            for p in parts[:-1]:
+                node = node.setdefault(p, {})
+            node.setdefault(parts[-1], [])
+        print(f"{DIR_COLOR}{os.path.abspath(args.path)}{os.sep}{RESET}")
+        print_tree(tree)
+        sys.exit(0)
+
+    # list intents
+    if args.intent_list:
+        print("Supported intents:")
+        for i in sorted(INTENT_PATTERNS):
+            print("  -", i)
+        sys.exit(0)
+
+    root = args.path
+    if args.staged:
+        if scanner.repo() is None:
+            print(f"{Fore.YELLOW}⚠️  Not a git repo, ignoring --staged{RESET}")
+        else:
+            scanner.staged = True
+
+    # search
+    if args.query:
+        try:
+            hits = scanner.query(args.query)
+        except ValueError as e:
+            color_error(f"⚠️  {e}")
+            sys.exit(1)
+    elif args.value:
+        hits = scanner.search(args.value)
+    else:
+        if not args.intent:
+            parser.print_help(); sys.exit(1)
+        try:
+            if args.transitive is not None:
+                hits = scanner.transitive([args.intent], args.transitive, args.index)
+            else:
+                hits = scanner.scan([args.intent])
+        except ValueError as e:
+            color_error(f"⚠️  {e}")
+            sys.exit(1)
+
+    # streaming exporters: nothing is materialised
+    fmt = args.format or ("json" if args.json or args.output else None)
+    if fmt and not (args.stats or args.interactive):
+        if args.context:
+            hits = (
+                Hit(h.path, ln, c, h.intent, h.chain)
+                for h in hits for ln, c in scanner.context(h.path, h.line, args.context)
+            )
+        blame = (lambda h: scanner.blame(h.path, h.line)) if args.blame else None
+        with open_output(args.output, EXPORTERS[fmt].binary) as fh:
+            export_hits(hits, fmt, fh, root, blame)
+        sys.exit(0)
+
+    if args.transitive is not None:
+        hits = (h._replace(code=f"{h.code}  ⇐ {' → '.join(h.chain)}") for h in hits)
+    matches, _ = collect(hits)
+    if not matches:
+        if args.json:
+            print("[]")
+        else:
+            color_error("⚠️  No files matched your criteria!")
+        sys.exit(0)
+
+    if args.context:
+        ctx = {}
+        for p, hits in matches.items():
+            ctx[p] = []
+            for ln, _ in hits:
+                ctx[p].extend(scanner.context(p, ln, args.context))
+        matches = ctx
+
+    if args.stats:
+        s = stats(matches, scanner.stats)
+        if args.json:
+            print(json.dumps(s, indent=2))
+        else:
+            fmt = args.report or "markdown"
+            print_report(s, fmt)
+        sys.exit(0)
+
+    if args.interactive:
+        interactive_view(matches)
+        sys.exit(0)
+
+    # final output
+    if args.table:
+        output_table(matches)
+    else:
+        print(f"{DIR_COLOR}{os.path.abspath(root)}{os.sep}{RESET}")
+        tree = build_tree(matches, root)
+        print_tree(tree)
+
+if __name__ == "__main__":
+    main()
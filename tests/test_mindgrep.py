@@ -0,0 +1,399 @@
+import io
+import json
+import os
+
+import mindgrep
+from mindgrep import Hit, Scanner
+
+HTTP_SRC = 'import requests\n\ndef fetch(url):\n    return requests.get(url)\n'
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    with open(str(path), "w", encoding="utf-8") as fh:
+        fh.write(text)
+    return str(path)
+
+
+# ─── Scanner ─────────────────────────────────────────────────────────────────
+def test_scan_yields_typed_hits(tmp_path):
+    path = write(tmp_path / "a.py", HTTP_SRC)
+    hits = list(Scanner(str(tmp_path)).scan("http"))
+    assert hits == [Hit(path, 4, "return requests.get(url)", "http request")]
+
+
+def test_unknown_intent_raises(tmp_path):
+    try:
+        Scanner(str(tmp_path)).scan("zzqqxx")
+    except ValueError as e:
+        assert "zzqqxx" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_cache_revalidates_changed_files(tmp_path):
+    path = write(tmp_path / "a.py", HTTP_SRC)
+    scanner = Scanner(str(tmp_path))
+    assert len(list(scanner.scan("http"))) == 1
+    write(path, HTTP_SRC + "requests.post(url)\n")
+    assert sorted(h.line for h in scanner.scan("http")) == [4, 5]
+
+
+def test_cache_is_bounded_by_bytes(tmp_path):
+    for i in range(5):
+        write(tmp_path / f"m{i}.py", HTTP_SRC)
+    scanner = Scanner(str(tmp_path), max_cached_bytes=len(HTTP_SRC) * 2)
+    list(scanner.scan("http"))
+    assert len(scanner._files) == 2
+
+
+def test_git_helpers_wrap_scanner(tmp_path):
+    from git import Actor, Repo
+    root = tmp_path / "repo"
+    path = write(root / "a.py", HTTP_SRC)
+    repo = Repo.init(str(root))
+    repo.index.add(["a.py"])
+    author = Actor("dev", "dev@example.com")
+    commit = repo.index.commit("init", author=author, committer=author)
+    write(root / "b.py", "x = 1\n")
+    repo.index.add(["b.py"])
+    assert mindgrep.get_staged_files(str(root)) == ["b.py"]
+    blamed, lines = mindgrep.get_blame(path, 4)
+    assert blamed.hexsha == commit.hexsha and lines == ["    return requests.get(url)"]
+    assert mindgrep.get_staged_files(str(tmp_path)) is None
+
+
+def test_scan_file_ast_uses_compiled_patterns(tmp_path):
+    path = write(tmp_path / "a.py", "import boto3\nboto3.client('s3')\nboto3.client('dynamodb')\n")
+    hits = mindgrep.scan_file_ast(path, ["boto3.client('dynamodb')"])
+    assert hits == [(3, "boto3.client('dynamodb')")]
+
+
+# ─── deduplication ───────────────────────────────────────────────────────────
+def make_duplicates(tmp_path):
+    src = write(tmp_path / "pkg" / "a.py", HTTP_SRC)
+    write(tmp_path / "pkg" / "b.py", HTTP_SRC)                  # identical copy
+    os.link(src, str(tmp_path / "pkg" / "c.py"))                # hard link
+    os.symlink(src, str(tmp_path / "pkg" / "d.py"))             # file symlink
+    os.symlink(str(tmp_path / "pkg"), str(tmp_path / "alias"))  # dir symlink
+
+
+def test_dedupe_counts_and_fans_out_hits(tmp_path):
+    make_duplicates(tmp_path)
+    scanner = Scanner(str(tmp_path))
+    paths = sorted(os.path.basename(h.path) for h in scanner.scan("http"))
+    assert paths == ["a.py", "b.py", "c.py", "d.py"]
+    assert scanner.stats == {"files": 1, "dup_inode": 2, "dup_content": 1}
+
+
+def test_follow_links_walks_each_directory_once(tmp_path):
+    make_duplicates(tmp_path)
+    scanner = Scanner(str(tmp_path), follow_links=True)
+    assert len(list(scanner.scan("http"))) == 4
+
+
+def test_no_dedupe_reads_every_path(tmp_path):
+    make_duplicates(tmp_path)
+    scanner = Scanner(str(tmp_path), dedupe=False)
+    assert len(list(scanner.scan("http"))) == 4
+    assert scanner.stats == {"files": 4, "dup_inode": 0, "dup_content": 0}
+
+
+# ─── query language ──────────────────────────────────────────────────────────
+QUERY_SRC = (
+    "import requests, subprocess, logging\n"
+    "\n"
+    "def fetch(url):\n"
+    "    password = 'x'\n"
+    "    logging.info('password')\n"
+    "    return requests.get(url)\n"
+    "\n"
+    "def run(cmd):\n"
+    "    subprocess.run(cmd)\n"
+)
+
+
+def query_lines(root, expr, **kw):
+    return sorted((os.path.basename(h.path), h.line) for h in Scanner(str(root), **kw).query(expr))
+
+
+def test_query_parse_orders_by_cost():
+    q = mindgrep.Query('"http request" AND NOT name:test AND text:password')
+    assert str(q) == "(NOT name:test AND text:'password' AND intent:'http request')"
+
+
+def test_query_syntax_errors():
+    for expr in ("http AND (", "", '"unterminated', "AND http",
+                 "NOT validation", "ext:py AND NOT http", "file:a.py", "http OR name:a"):
+        try:
+            mindgrep.Query(expr)
+        except mindgrep.QueryError:
+            pass
+        else:
+            raise AssertionError(expr)
+
+
+def test_query_boolean_evaluation(tmp_path):
+    write(tmp_path / "a.py", QUERY_SRC)
+    write(tmp_path / "b.py", "import requests\nrequests.get(u)\n")
+    assert query_lines(tmp_path, "http AND shell") == [("a.py", 6), ("a.py", 9)]
+    assert query_lines(tmp_path, "http AND NOT shell") == [("b.py", 2)]
+    assert query_lines(tmp_path, "http AND name:b") == [("b.py", 2)]
+
+
+def test_query_function_scope_reports_each_line_once(tmp_path):
+    write(tmp_path / "a.py", QUERY_SRC)
+    assert query_lines(tmp_path, "func(text:password AND logging)") == [("a.py", 4), ("a.py", 5)]
+    assert query_lines(tmp_path, "func(http AND shell)") == []
+
+
+def test_query_intents_skip_non_python_files(tmp_path):
+    write(tmp_path / "notes.txt", "requests.get(url)\npassword\n")
+    write(tmp_path / "x.py", "requests.get(url)\npassword\n")
+    assert query_lines(tmp_path, "http OR text:zzz") == [("x.py", 1)]
+    assert query_lines(tmp_path, "http OR text:zzz", dedupe=False) == [("x.py", 1)]
+    assert query_lines(tmp_path, "text:password AND NOT http") == [("notes.txt", 2)]
+    assert query_lines(tmp_path, "func(text:password)") == []
+
+
+# ─── exporters ───────────────────────────────────────────────────────────────
+EXPORT_HITS = [
+    Hit("src/a.py", 4, "return requests.get(url)", "http request"),
+    Hit("src/b.py", 10, "fetch('ü' * 40)", "http request", ("b.main", "a.fetch", "requests.get")),
+    Hit("notes.txt", 300, "x" * 70000, None),
+]
+
+
+def export(fmt, hits=EXPORT_HITS):
+    fh = io.BytesIO() if mindgrep.EXPORTERS[fmt].binary else io.StringIO()
+    assert mindgrep.export_hits(iter(hits), fmt, fh, root=".") == len(hits)
+    return fh.getvalue()
+
+
+def test_compact_round_trip():
+    records = list(mindgrep.read_compact(export("compact")))
+    assert records == [mindgrep.hit_record(h) for h in EXPORT_HITS]
+    assert list(mindgrep.read_compact(export("compact", []))) == []
+
+
+def test_json_exporter_matches_indented_dump():
+    assert export("json") == json.dumps([h.to_dict() for h in EXPORT_HITS], indent=2) + "\n"
+    assert export("json", []) == "[]\n"
+
+
+def test_jsonl_and_sarif_are_valid_documents():
+    lines = export("jsonl").splitlines()
+    assert [json.loads(l) for l in lines] == [mindgrep.hit_record(h) for h in EXPORT_HITS]
+    sarif = json.loads(export("sarif"))
+    run = sarif["runs"][0]
+    assert len(run["results"]) == 3
+    assert {r["id"] for r in run["tool"]["driver"]["rules"]} == {"http-request", "text-match"}
+
+
+def test_sarif_uris_are_percent_encoded():
+    sarif = json.loads(export("sarif", [Hit("src/my file#2.py", 1, "x", None)]))
+    loc = sarif["runs"][0]["results"][0]["locations"][0]["physicalLocation"]
+    assert loc["artifactLocation"]["uri"] == "src/my%20file%232.py"
+
+
+def test_stdout_export_writes_through_colorama_wrapper(monkeypatch):
+    from colorama.ansitowin32 import AnsiToWin32
+    out = io.StringIO()
+    wrapper = AnsiToWin32(out, autoreset=True).stream
+    monkeypatch.setattr(mindgrep.colorama_init, "orig_stdout", out)
+    monkeypatch.setattr(mindgrep.colorama_init, "wrapped_stdout", wrapper)
+    monkeypatch.setattr("sys.stdout", wrapper)
+    with mindgrep.open_output() as fh:
+        mindgrep.export_hits(iter(EXPORT_HITS[:1]), "jsonl", fh)
+    assert json.loads(out.getvalue()) == mindgrep.hit_record(EXPORT_HITS[0])
+    try:
+        with mindgrep.open_output(binary=True):
+            pass
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("binary export to a text-only stdout")
+
+
+# ─── call-graph index ────────────────────────────────────────────────────────
+def chains(scanner, index, hops=3):
+    return sorted(h.chain for h in scanner.transitive("http", hops, index))
+
+
+def bump(path, text):
+    """Rewrite ``path`` and move its mtime so the index sees a change."""
+    st = os.stat(path)
+    write(path, text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_call_graph_index_updates_incrementally(tmp_path):
+    root, index = tmp_path / "proj", str(tmp_path / "idx.sqlite")
+    write(root / "utils" / "__init__.py", "")
+    write(root / "utils" / "net.py", HTTP_SRC)
+    app = write(root / "app.py", "from utils.net import fetch\n\ndef main():\n    fetch('a')\n")
+    scanner = Scanner(str(root))
+    assert chains(scanner, index) == [
+        ("app.main", "utils.net.fetch", "requests.get"),
+        ("utils.net.fetch", "requests.get"),
+    ]
+    graph = scanner._graph
+    assert graph.update(scanner) == (0, 0)
+
+    # an edited file is re-indexed in place, not inserted twice
+    bump(app, "import utils.net as un\n\ndef other():\n    un.fetch('b')\n\ndef top():\n    other()\n")
+    assert graph.update(scanner) == (1, 0)
+    assert chains(scanner, index) == [
+        ("app.other", "utils.net.fetch", "requests.get"),
+        ("app.top", "app.other", "utils.net.fetch", "requests.get"),
+        ("utils.net.fetch", "requests.get"),
+    ]
+    assert chains(scanner, index, hops=0) == [("utils.net.fetch", "requests.get")]
+
+    os.remove(app)
+    assert graph.update(scanner) == (0, 1)
+    assert chains(scanner, index) == [("utils.net.fetch", "requests.get")]
+
+    # persisted: a fresh handle has nothing to re-index
+    scanner.clear_cache()
+    fresh = mindgrep.CallGraphIndex(index)
+    try:
+        assert fresh.update(Scanner(str(root))) == (0, 0)
+    finally:
+        fresh.close()
+
+
+def test_call_graph_index_rebuilds_older_schema(tmp_path):
+    import sqlite3
+    index = str(tmp_path / "idx.sqlite")
+    db = sqlite3.connect(index)
+    db.executescript("CREATE TABLE funcs (qualname TEXT, path TEXT, line INTEGER);"
+                     "PRAGMA user_version = 1;")
+    db.close()
+    graph = mindgrep.CallGraphIndex(index)
+    try:
+        tables = {r[0] for r in graph.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert tables == {"files", "calls"}
+    finally:
+        graph.close()
+
+
+def test_call_graph_follows_methods_and_constructors(tmp_path):
+    write(tmp_path / "m.py", (
+        "import requests\n"
+        "class Client:\n"
+        "    def __init__(self):\n"
+        "        self.s = requests.Session()\n"
+        "    def call(self):\n"
+        "        return self.helper()\n"
+        "    def helper(self):\n"
+        "        return requests.get('x')\n"
+        "def make():\n"
+        "    return Client()\n"
+    ))
+    scanner = Scanner(str(tmp_path))
+    assert chains(scanner, str(tmp_path / "idx.sqlite")) == [
+        ("m.Client.__init__", "requests.Session"),
+        ("m.Client.call", "m.Client.helper", "requests.get"),
+        ("m.Client.helper", "requests.get"),
+        ("m.make", "m.Client.__init__", "requests.Session"),
+    ]
+    scanner.clear_cache()
+
+
+# ─── argument-aware patterns ─────────────────────────────────────────────────
+def test_compile_pattern_forms():
+    assert mindgrep.compile_pattern("requests.get") == ("requests.get", None)
+    assert mindgrep.compile_pattern("open(") == ("open", None)
+    assert mindgrep.compile_pattern("try:") == ("try:", None)
+    assert mindgrep.compile_pattern("ruamel.yaml.YAML().load") == ("ruamel.yaml.YAML().load", None)
+    name, check = mindgrep.compile_pattern("subprocess.Popen(shell=True")
+    assert name == "subprocess.Popen" and check is not None
+
+
+def test_argument_predicates_decide_constrained_intents(tmp_path):
+    write(tmp_path / "s.py", (
+        "import subprocess, requests, boto3, ruamel.yaml\n"
+        "subprocess.Popen('x', shell=False)\n"
+        "subprocess.Popen('x', shell=True)\n"
+        "requests.get(u, verify=False)\n"
+        "requests.get(u)\n"
+        "boto3.client('dynamodb', region_name='x')\n"
+        "boto3.client('s3')\n"
+        "boto3.client(service_name='dynamodb')\n"
+        "ruamel.yaml.YAML(typ='safe').load(f)\n"
+    ))
+    scanner = Scanner(str(tmp_path))
+    lines = lambda intent: sorted(h.line for h in scanner.scan(intent))
+    assert lines("unsafe shell") == [3]
+    assert lines("shell exec") == [2, 3]
+    assert lines("insecure tls") == [4]
+    assert lines("database access") == [6, 8]
+    assert lines("yaml") == [9]
+
+
+# ─── pipelined I/O ───────────────────────────────────────────────────────────
+def make_tree(tmp_path, n=40):
+    for i in range(n):
+        write(tmp_path / f"d{i % 4}" / f"m{i}.py", HTTP_SRC * (i % 3 + 1) + f"# {i} password\n")
+    write(tmp_path / "notes.txt", "password\n" * 50)
+
+
+def test_pipelined_scans_match_sequential(tmp_path):
+    make_tree(tmp_path)
+    make_duplicates(tmp_path)
+    for opts in ({"io_threads": 4}, {"io_threads": 3, "prefetch_bytes": 64}):
+        seq, pipe = Scanner(str(tmp_path)), Scanner(str(tmp_path), **opts)
+        assert list(pipe.scan("http")) == list(seq.scan("http"))
+        assert list(pipe.search("password")) == list(seq.search("password"))
+        assert list(pipe.query("http AND text:password")) == list(seq.query("http AND text:password"))
+        assert pipe.stats.pop("io_wait") >= 0
+        assert pipe.stats == seq.stats
+
+
+def test_pipelined_reads_each_inode_once(tmp_path, monkeypatch):
+    make_duplicates(tmp_path)
+    reads = []
+    real_read = Scanner._read
+    monkeypatch.setattr(Scanner, "_read", staticmethod(
+        lambda path, stamp: reads.append(os.path.basename(path)) or real_read(path, stamp)))
+    scanner = Scanner(str(tmp_path), io_threads=4, cache=False)
+    assert len(list(scanner.scan("http"))) == 4
+    assert len(reads) == 2      # a.py (or a link to it) and the b.py copy
+    assert scanner.stats["dup_inode"] == 2
+
+
+def test_prefetch_budget_bounds_bytes_held(tmp_path, monkeypatch):
+    import threading
+    import time
+    for i in range(24):
+        write(tmp_path / f"m{i}.py", f"# {i}\n" + "x = 1\n" * 150)
+    size = os.path.getsize(str(tmp_path / "m10.py"))
+    lock, live, peak = threading.Lock(), [0], [0]
+    real_prefetch, real_remember = Scanner._prefetch, Scanner._remember
+
+    def prefetch(self, path, st):
+        with lock:
+            live[0] += st.st_size
+            peak[0] = max(peak[0], live[0])
+        time.sleep(0.002)
+        return real_prefetch(self, path, st)
+
+    def remember(self, path, src):
+        with lock:
+            live[0] -= src.stamp[1]
+        real_remember(self, path, src)
+
+    monkeypatch.setattr(Scanner, "_prefetch", prefetch)
+    monkeypatch.setattr(Scanner, "_remember", remember)
+    for budget in (3 * size, 1):
+        peak[0] = 0
+        scanner = Scanner(str(tmp_path), io_threads=4, prefetch_bytes=budget)
+        assert len(list(scanner.search("x = 1"))) == 24 * 150
+        assert 0 < peak[0] <= max(budget, size)
+
+
+def test_prefetch_budget_parses_sizes():
+    assert mindgrep._parse_size("65536") == 65536
+    assert mindgrep._parse_size("64M") == 64 << 20
+    assert mindgrep._parse_size("1g") == 1 << 30